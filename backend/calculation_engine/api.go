@@ -145,6 +145,10 @@ func fetchBazaarData() error {
 		if product.ProductID != "" && product.ProductID != id {
 			dlog("API Cache: Product ID mismatch for key '%s': product_id field is '%s'", id, product.ProductID)
 		}
+		// Only the top order of each summary is ever read; drop the rest so the cached response doesn't pin them
+		product.SellSummary = topOrderOnly(product.SellSummary)
+		product.BuySummary = topOrderOnly(product.BuySummary)
+		apiResp.Products[id] = product
 	}
 
 	apiResponseCache = &apiResp   // Update the cache with the new, successful response
@@ -156,6 +160,15 @@ func fetchBazaarData() error {
 	return nil // Success
 }
 
+// topOrderOnly returns a fresh one-element copy of the first order in summary (nil if empty),
+// releasing the backing array that holds the remaining orders.
+func topOrderOnly(summary []OrderSummary) []OrderSummary {
+	if len(summary) == 0 {
+		return nil
+	}
+	return []OrderSummary{summary[0]}
+}
+
 // getApiResponse is called by the main application logic to get the latest API data.
 // This version will trigger a fresh fetch on every call.
 func getApiResponse() (*HypixelAPIResponse, error) {
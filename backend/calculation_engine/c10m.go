@@ -6,6 +6,26 @@ import (
 	"math"
 )
 
+// instaFillsPerCycle returns IF = SellSize * (SellFrequency / OrderFrequency) for already
+// clamped (non-negative) metrics: how many units other players insta-sell during the lifetime
+// of one of our buy orders. No order activity (o_f <= 0) means nothing fills, so IF is 0.
+func instaFillsPerCycle(s_s, s_f, o_f float64) float64 {
+	if o_f <= 0 {
+		return 0
+	}
+	return math.Max(0, s_s*(s_f/o_f))
+}
+
+// relistRate returns RR = Ceil(qty / IF), the number of order cycles needed to fill qty.
+// RR is at least 1, and +Inf when nothing insta-fills (IF <= 0) or the inputs are unusable.
+func relistRate(qty, ifValue float64) float64 {
+	// Single guard for every degenerate input (also catches NaN IF/qty), then a clamp-only fast path.
+	if !(ifValue > 0) || math.IsNaN(qty) {
+		return math.Inf(1)
+	}
+	return math.Max(1, math.Ceil(qty/ifValue))
+}
+
 // calculateC10MInternal is the core logic for C10M calculation.
 // It takes all necessary pre-fetched and validated inputs.
 func calculateC10MInternal(
@@ -16,7 +36,9 @@ func calculateC10MInternal(
 	pm ProductMetrics, // ProductMetrics for the item
 ) (c10mPrimary, c10mSecondary, ifValue, rrValue, deltaRatio, adjustment float64, err error) {
 
-	dlog("  [Internal C10M Calc] For %.2f x %s", qty, prodID)
+	if isDebug {
+		dlog("  [Internal C10M Calc] For %.2f x %s", qty, prodID)
+	}
 
 	// Validate inputs
 	if qty <= 0 {
@@ -37,7 +59,9 @@ func calculateC10MInternal(
 
 	supplyRate := s_s * s_f
 	demandRate := o_s * o_f // Demand based on buy orders being placed by others
-	dlog("    Rates for %s: SupplyRate (s_s*s_f)=%.4f (ss:%.2f * sf:%.2f), DemandRate (o_s*o_f)=%.4f (os:%.2f * of:%.2f)", prodID, supplyRate, s_s, s_f, demandRate, o_s, o_f)
+	if isDebug {
+		dlog("    Rates for %s: SupplyRate (s_s*s_f)=%.4f (ss:%.2f * sf:%.2f), DemandRate (o_s*o_f)=%.4f (os:%.2f * of:%.2f)", prodID, supplyRate, s_s, s_f, demandRate, o_s, o_f)
+	}
 
 	// Delta Ratio: Ratio of supply to demand pressure
 	if demandRate <= 0 { // Avoid division by zero
@@ -49,69 +73,62 @@ func calculateC10MInternal(
 	} else {
 		deltaRatio = supplyRate / demandRate
 	}
-	dlog("    DeltaRatio (SR/DR) for %s: %.4f", prodID, deltaRatio)
+	if isDebug {
+		dlog("    DeltaRatio (SR/DR) for %s: %.4f", prodID, deltaRatio)
+	}
 
 	// Base cost for Primary C10M (cost if order fills instantly at sellP)
 	baseCostPrimary := qty * sellP
-	dlog("    Base Cost (Primary C10M) for %s (qty * sellP): %.2f * %.2f = %.2f", prodID, qty, sellP, baseCostPrimary)
+	if isDebug {
+		dlog("    Base Cost (Primary C10M) for %s (qty * sellP): %.2f * %.2f = %.2f", prodID, qty, sellP, baseCostPrimary)
+	}
 
 	// --- Primary C10M Calculation (Buy Order Cost) ---
 	if deltaRatio > 1.0 { // More supply than demand pressure: order likely fills fast
-		dlog("    DeltaRatio > 1.0 for %s: Simplified logic (fast fill).", prodID)
+		if isDebug {
+			dlog("    DeltaRatio > 1.0 for %s: Simplified logic (fast fill).", prodID)
+		}
 		ifValue = math.Inf(1) // Effectively infinite insta-fills relative to order size
 		rrValue = 1.0         // One round of orders needed
 		adjustment = 0.0      // No upward adjustment needed
 		c10mPrimary = baseCostPrimary
-		dlog("    Primary C10M for %s = baseCostPrimary = %.2f", prodID, c10mPrimary)
-	} else { // deltaRatio <= 1.0: Demand matches or exceeds supply pressure, slower fill
-		dlog("    DeltaRatio <= 1.0 for %s: Full IF/RR logic.", prodID)
-
-		// Calculate InstaFills (IF) per order cycle
-		if o_f <= 0 { // If no orders are being placed by others (OrderFrequency is 0)
-			ifValue = 0 // No opportunity for our order to be insta-filled by new sell orders
-			dlog("    IF Calc for %s: OrderFrequency (o_f) <= 0. IF = 0.", prodID)
-		} else {
-			// IF = SellSize * (SellFrequency / OrderFrequency)
-			// This represents how many items (s_s) are insta-sold by others during the typical lifetime of one of our buy orders.
-			ifValue = s_s * (s_f / o_f)
-			dlog("    IF Calc for %s: s_s * (s_f / o_f) = %.4f * (%.4f / %.4f) = %.4f", prodID, s_s, s_f, o_f, ifValue)
+		if isDebug {
+			dlog("    Primary C10M for %s = baseCostPrimary = %.2f", prodID, c10mPrimary)
 		}
-		ifValue = math.Max(0, ifValue) // Ensure IF is not negative
-		dlog("    Final Calculated IF for %s: %.4f", prodID, ifValue)
-
-		// Calculate RelistRate (RR)
-		if ifValue <= 0 { // If no items are insta-filled per order cycle
-			// If there's also no general supply (supplyRate is 0), then RR is Inf (never fills)
-			// If there IS supply, but IF is 0 (e.g., o_f was 0), it implies a complex situation.
-			// For simplicity, if IF is 0, assume RR becomes effectively infinite for filling 'qty'.
-			rrValue = math.Inf(1)
-			dlog("    RR Calc for %s: IF <= 0 -> RR = Inf.", prodID)
-		} else {
-			rrValue = math.Ceil(qty / ifValue) // How many order cycles to fill 'qty'
-			dlog("    RR Calc for %s: Ceil(qty / IF) = Ceil(%.2f / %.4f) = %.2f", prodID, qty, ifValue, rrValue)
+	} else { // deltaRatio <= 1.0: Demand matches or exceeds supply pressure, slower fill
+		if isDebug {
+			dlog("    DeltaRatio <= 1.0 for %s: Full IF/RR logic.", prodID)
 		}
-		// RR must be at least 1, unless it's already Inf (which means it'll never fill)
-		if rrValue < 1 && !math.IsInf(rrValue, 1) {
-			rrValue = 1.0
+
+		// Calculate InstaFills (IF) per order cycle and the RelistRate (RR) needed to fill 'qty'
+		ifValue = instaFillsPerCycle(s_s, s_f, o_f)
+		if isDebug {
+			dlog("    Final Calculated IF for %s: %.4f (s_s:%.4f, s_f:%.4f, o_f:%.4f)", prodID, ifValue, s_s, s_f, o_f)
 		}
-		if math.IsNaN(rrValue) { // Should not happen if IF logic is correct, but defensive
-			rrValue = math.Inf(1)
+		rrValue = relistRate(qty, ifValue)
+		if isDebug {
+			dlog("    Final RR for %s: %.2f", prodID, rrValue)
 		}
-		dlog("    Final RR for %s: %.2f", prodID, rrValue)
 
 		// Calculate cost adjustment factor
 		if math.IsInf(rrValue, 1) { // If RR is infinite, primary cost is infinite
-			dlog("    RR is Infinite for %s, Primary C10M is Infinite.", prodID)
+			if isDebug {
+				dlog("    RR is Infinite for %s, Primary C10M is Infinite.", prodID)
+			}
 			c10mPrimary = math.Inf(1)
 			adjustment = 0.0 // No meaningful adjustment if cost is already Inf
 		} else {
 			if rrValue <= 1.0 { // If fills in one round or less (deltaRatio > 1 case effectively)
 				adjustment = 0.0
-				dlog("    Adjustment factor for %s: RR <= 1.0 -> adj = 0.0", prodID)
+				if isDebug {
+					dlog("    Adjustment factor for %s: RR <= 1.0 -> adj = 0.0", prodID)
+				}
 			} else {
 				// Adjustment factor: (1 - 1/RR), approaches 1 as RR increases
 				adjustment = 1.0 - (1.0 / rrValue)
-				dlog("    Adjustment factor for %s: 1.0 - (1.0 / %.2f) = %.4f", prodID, rrValue, adjustment)
+				if isDebug {
+					dlog("    Adjustment factor for %s: 1.0 - (1.0 / %.2f) = %.4f", prodID, rrValue, adjustment)
+				}
 			}
 
 			// Calculate extra cost due to relisting (simplified model).
@@ -132,40 +149,56 @@ func calculateC10MInternal(
 				// which would imply a "gain" rather than a cost, so it gets clamped to 0 below.
 				extraTerm := (qty * rrValue) - (ifValue * sumK)
 				extraCalculatedPart = sellP * math.Max(0, extraTerm)
-				dlog("    Extra Cost Part for %s: sellP * Max(0, (qty*RR - IF*sumK(RRint=%d))) = %.2f * Max(0, (%.2f*%.2f - %.4f*%.2f)) = %.2f",
-					prodID, sellP, RRint, qty, rrValue, ifValue, sumK, extraCalculatedPart)
+				if isDebug {
+					dlog("    Extra Cost Part for %s: sellP * Max(0, (qty*RR - IF*sumK(RRint=%d))) = %.2f * Max(0, (%.2f*%.2f - %.4f*%.2f)) = %.2f",
+						prodID, sellP, RRint, qty, rrValue, ifValue, sumK, extraCalculatedPart)
+				}
 			} else {
-				dlog("    Extra Cost Part for %s: Skipped (adjustment is 0).", prodID)
+				if isDebug {
+					dlog("    Extra Cost Part for %s: Skipped (adjustment is 0).", prodID)
+				}
 			}
 
 			c10mPrimary = baseCostPrimary + (adjustment * extraCalculatedPart)
 			// Validate c10mPrimary
 			if math.IsInf(c10mPrimary, 0) || math.IsNaN(c10mPrimary) {
-				dlog("    Primary C10M for %s calculation resulted in Inf/NaN.", prodID)
+				if isDebug {
+					dlog("    Primary C10M for %s calculation resulted in Inf/NaN.", prodID)
+				}
 				c10mPrimary = math.Inf(1) // Ensure positive Inf for error
 			} else if c10mPrimary < 0 { // Cost should not be negative
-				dlog("    WARN: Primary C10M for %s calculation resulted in negative (%.2f). Clamping to base or Inf.", prodID, c10mPrimary)
+				if isDebug {
+					dlog("    WARN: Primary C10M for %s calculation resulted in negative (%.2f). Clamping to base or Inf.", prodID, c10mPrimary)
+				}
 				// If it's negative, it suggests an issue with the 'extra' calculation or parameters.
 				// Fallback to baseCostPrimary or Inf if baseCostPrimary is also problematic.
 				c10mPrimary = math.Max(baseCostPrimary, 0) // Ensure it's at least base, or 0 if base was also bad. More robust: math.Inf(1)
 			} else {
-				dlog("    Primary C10M for %s: baseCostPrimary + adjustment*extra = %.2f + %.4f*%.2f = %.2f", prodID, baseCostPrimary, adjustment, extraCalculatedPart, c10mPrimary)
+				if isDebug {
+					dlog("    Primary C10M for %s: baseCostPrimary + adjustment*extra = %.2f + %.4f*%.2f = %.2f", prodID, baseCostPrimary, adjustment, extraCalculatedPart, c10mPrimary)
+				}
 			}
 		}
 	}
 
 	// --- Secondary C10M Calculation (Insta-Buy Cost) ---
 	c10mSecondary = qty * buyP // Cost to insta-buy 'qty' at the current top buy order price
-	dlog("    Secondary C10M (Instabuy) for %s = qty * buyP = %.2f * %.2f = %.2f", prodID, qty, buyP, c10mSecondary)
+	if isDebug {
+		dlog("    Secondary C10M (Instabuy) for %s = qty * buyP = %.2f * %.2f = %.2f", prodID, qty, buyP, c10mSecondary)
+	}
 
 	// Validate c10mSecondary
 	if math.IsNaN(c10mSecondary) || math.IsInf(c10mSecondary, -1) || c10mSecondary < 0 { // Negative Inf or negative cost
-		dlog("    Secondary C10M for %s validation failed (%.2f), setting to Inf.", prodID, c10mSecondary)
+		if isDebug {
+			dlog("    Secondary C10M for %s validation failed (%.2f), setting to Inf.", prodID, c10mSecondary)
+		}
 		c10mSecondary = math.Inf(1) // Ensure positive Inf for error
 	}
 
-	dlog("  [Internal C10M Calc] Results for %s: Prim=%.2f, Sec=%.2f, IF=%.4f, RR=%.2f, DeltaRatio=%.4f, AdjFactor=%.4f, Err=%v",
-		prodID, c10mPrimary, c10mSecondary, ifValue, rrValue, deltaRatio, adjustment, err)
+	if isDebug {
+		dlog("  [Internal C10M Calc] Results for %s: Prim=%.2f, Sec=%.2f, IF=%.4f, RR=%.2f, DeltaRatio=%.4f, AdjFactor=%.4f, Err=%v",
+			prodID, c10mPrimary, c10mSecondary, ifValue, rrValue, deltaRatio, adjustment, err)
+	}
 
 	return // Returns named variables
 }
@@ -178,9 +211,23 @@ func getBestC10M(
 	apiResp *HypixelAPIResponse,
 	metricsMap map[string]ProductMetrics,
 ) (bestCost float64, bestMethod string, associatedCost float64, rrValue float64, ifValue float64, err error) {
-
 	itemIDNorm := BAZAAR_ID(itemID)
-	dlog("Getting Best C10M for %.2f x %s", quantity, itemIDNorm)
+	productData, apiOk := safeGetProductData(apiResp, itemIDNorm)
+	metricsData, metricsOk := safeGetMetricsData(metricsMap, itemIDNorm)
+	return getBestC10MFromData(itemIDNorm, quantity, productData, apiOk, metricsData, metricsOk)
+}
+
+// getBestC10MFromData is getBestC10M for callers that have already looked up the item's
+// API and metrics data (and need the metrics themselves), so the lookups aren't repeated.
+func getBestC10MFromData(
+	itemIDNorm string,
+	quantity float64,
+	productData HypixelProduct, apiOk bool,
+	metricsData ProductMetrics, metricsOk bool,
+) (bestCost float64, bestMethod string, associatedCost float64, rrValue float64, ifValue float64, err error) {
+	if isDebug {
+		dlog("Getting Best C10M for %.2f x %s", quantity, itemIDNorm)
+	}
 
 	// Initialize return values for error cases or N/A
 	bestCost = math.Inf(1)      // Default to infinite cost
@@ -195,14 +242,12 @@ func getBestC10M(
 		return 0, "N/A", 0, 0, 0, err // Or specific values for 0 quantity if defined.
 	}
 
-	// Get API and Metrics data
-	productData, apiOk := safeGetProductData(apiResp, itemIDNorm)
-	metricsData, metricsOk := safeGetMetricsData(metricsMap, itemIDNorm)
-
 	var sellP, buyP float64 = math.NaN(), math.NaN() // Prices from API
 
 	if !apiOk {
-		dlog("  [%s] API data not found.", itemIDNorm)
+		if isDebug {
+			dlog("  [%s] API data not found.", itemIDNorm)
+		}
 		err = fmt.Errorf("API data not found for %s", itemIDNorm)
 		// All return values remain at their error/default state
 		return // bestCost=Inf, bestMethod="N/A", etc.
@@ -219,19 +264,27 @@ func getBestC10M(
 	// Validate extracted prices
 	if sellP <= 0 || buyP <= 0 || math.IsNaN(sellP) || math.IsNaN(buyP) || math.IsInf(sellP, 0) || math.IsInf(buyP, 0) {
 		errMsg := fmt.Sprintf("invalid prices from API for %s (sP: %.2f, bP: %.2f)", itemIDNorm, sellP, buyP)
-		dlog("  [%s] %s", itemIDNorm, errMsg)
+		if isDebug {
+			dlog("  [%s] %s", itemIDNorm, errMsg)
+		}
 		err = fmt.Errorf(errMsg) // Set the error
 		return                   // Return with error defaults
 	}
-	dlog("  [%s] Prices from API - SellP (for buy order): %.2f, BuyP (for instabuy): %.2f", itemIDNorm, sellP, buyP)
+	if isDebug {
+		dlog("  [%s] Prices from API - SellP (for buy order): %.2f, BuyP (for instabuy): %.2f", itemIDNorm, sellP, buyP)
+	}
 
 	// Handle case where metrics data is missing
 	if !metricsOk {
-		dlog("  [%s] Metrics data not found. Primary C10M calculation skipped. Evaluating Secondary C10M only.", itemIDNorm)
+		if isDebug {
+			dlog("  [%s] Metrics data not found. Primary C10M calculation skipped. Evaluating Secondary C10M only.", itemIDNorm)
+		}
 		// Only Secondary C10M (instabuy) is possible if no metrics for Primary C10M
 		c10mSec := quantity * buyP                                        // Instabuy cost
 		if math.IsNaN(c10mSec) || c10mSec < 0 || math.IsInf(c10mSec, 0) { // Validate instabuy cost
-			dlog("  [%s] Secondary C10M calculation failed (%.2f) even without metrics.", itemIDNorm, c10mSec)
+			if isDebug {
+				dlog("  [%s] Secondary C10M calculation failed (%.2f) even without metrics.", itemIDNorm, c10mSec)
+			}
 			errMsg := fmt.Sprintf("secondary C10M failed for %s", itemIDNorm)
 			if err != nil { // Append to existing API error if any (though unlikely here)
 				err = fmt.Errorf("%v; and %s", err, errMsg)
@@ -247,7 +300,9 @@ func getBestC10M(
 		// RR and IF are not applicable to Secondary method
 		rrValue = math.NaN()
 		ifValue = math.NaN()
-		dlog("  [%s] Using Secondary C10M (%.2f) due to missing metrics.", itemIDNorm, bestCost)
+		if isDebug {
+			dlog("  [%s] Using Secondary C10M (%.2f) due to missing metrics.", itemIDNorm, bestCost)
+		}
 		// Set error to indicate why only Secondary was chosen, if no other error exists
 		if err == nil {
 			err = fmt.Errorf("metrics not found for %s, only Secondary C10M available", itemIDNorm)
@@ -256,7 +311,9 @@ func getBestC10M(
 	}
 
 	// Both API and Metrics data are available, proceed with full C10M calculation
-	dlog("  [%s] Both API and Metrics data available. Calculating full C10M...", itemIDNorm)
+	if isDebug {
+		dlog("  [%s] Both API and Metrics data available. Calculating full C10M...", itemIDNorm)
+	}
 	var c10mPrim, c10mSec float64
 	var calcIF, calcRR float64 // Capture IF/RR from internal calculation
 	var calcErr error          // Error from internal calculation
@@ -264,7 +321,9 @@ func getBestC10M(
 	c10mPrim, c10mSec, calcIF, calcRR, _, _, calcErr = calculateC10MInternal(itemIDNorm, quantity, sellP, buyP, metricsData)
 
 	if calcErr != nil {
-		dlog("  [%s] Error during C10M internal calculation: %v", itemIDNorm, calcErr)
+		if isDebug {
+			dlog("  [%s] Error during C10M internal calculation: %v", itemIDNorm, calcErr)
+		}
 		if err == nil { // If no prior error (e.g. API price validation)
 			err = calcErr
 		} else { // Append to existing error
@@ -285,14 +344,18 @@ func getBestC10M(
 			associatedCost = quantity * sellP // Cost if order placed at sellP
 			rrValue = calcRR                  // Use RR from internal calculation
 			ifValue = calcIF                  // Use IF from internal calculation
-			dlog("  [%s] Primary (%.2f) <= Secondary (%.2f). Using Primary. AssocCost=%.2f, RR=%.2f, IF=%.4f", itemIDNorm, c10mPrim, c10mSec, associatedCost, rrValue, ifValue)
+			if isDebug {
+				dlog("  [%s] Primary (%.2f) <= Secondary (%.2f). Using Primary. AssocCost=%.2f, RR=%.2f, IF=%.4f", itemIDNorm, c10mPrim, c10mSec, associatedCost, rrValue, ifValue)
+			}
 		} else {
 			bestCost = c10mSec
 			bestMethod = "Secondary"
 			associatedCost = quantity * buyP // Cost if instabought at buyP
 			rrValue = math.NaN()             // RR not applicable for Secondary
 			ifValue = math.NaN()             // IF not applicable for Secondary
-			dlog("  [%s] Secondary (%.2f) < Primary (%.2f). Using Secondary. AssocCost=%.2f", itemIDNorm, c10mSec, c10mPrim, associatedCost)
+			if isDebug {
+				dlog("  [%s] Secondary (%.2f) < Primary (%.2f). Using Secondary. AssocCost=%.2f", itemIDNorm, c10mSec, c10mPrim, associatedCost)
+			}
 		}
 	} else if validPrim { // Only Primary is valid
 		bestCost = c10mPrim
@@ -300,21 +363,27 @@ func getBestC10M(
 		associatedCost = quantity * sellP
 		rrValue = calcRR
 		ifValue = calcIF
-		dlog("  [%s] Secondary C10M Invalid, using Primary C10M (%.2f). AssocCost=%.2f, RR=%.2f, IF=%.4f", itemIDNorm, bestCost, associatedCost, rrValue, ifValue)
+		if isDebug {
+			dlog("  [%s] Secondary C10M Invalid, using Primary C10M (%.2f). AssocCost=%.2f, RR=%.2f, IF=%.4f", itemIDNorm, bestCost, associatedCost, rrValue, ifValue)
+		}
 	} else if validSec { // Only Secondary is valid
 		bestCost = c10mSec
 		bestMethod = "Secondary"
 		associatedCost = quantity * buyP
 		rrValue = math.NaN()
 		ifValue = math.NaN()
-		dlog("  [%s] Primary C10M Invalid, using Secondary C10M (%.2f). AssocCost=%.2f", itemIDNorm, bestCost, associatedCost)
+		if isDebug {
+			dlog("  [%s] Primary C10M Invalid, using Secondary C10M (%.2f). AssocCost=%.2f", itemIDNorm, bestCost, associatedCost)
+		}
 	} else { // Neither is valid
 		bestCost = math.Inf(1) // Already default, but explicit
 		bestMethod = "N/A"     // Already default
 		associatedCost = math.NaN()
 		rrValue = math.NaN()
 		ifValue = math.NaN()
-		dlog("  [%s] Both Primary and Secondary C10M results are invalid.", itemIDNorm)
+		if isDebug {
+			dlog("  [%s] Both Primary and Secondary C10M results are invalid.", itemIDNorm)
+		}
 		if err == nil { // If no specific error yet, create one
 			err = fmt.Errorf("failed to determine any valid C10M for %s (both Primary/Secondary results invalid)", itemIDNorm)
 		}
@@ -342,6 +411,8 @@ func getBestC10M(
 		ifValue = math.NaN()
 	}
 
-	dlog("  [%s] Best C10M Final Result: Cost=%.2f, Method=%s, AssocCost=%.2f, RR=%.2f, IF=%.4f, Err=%v", itemIDNorm, bestCost, bestMethod, associatedCost, rrValue, ifValue, err)
+	if isDebug {
+		dlog("  [%s] Best C10M Final Result: Cost=%.2f, Method=%s, AssocCost=%.2f, RR=%.2f, IF=%.4f, Err=%v", itemIDNorm, bestCost, bestMethod, associatedCost, rrValue, ifValue, err)
+	}
 	return // Return named variables
 }
@@ -4,8 +4,6 @@ package main
 import (
 	"fmt"
 	"math"
-	"os"
-	"path/filepath"
 	"strings"
 )
 
@@ -92,7 +90,11 @@ func calculateDetailedCostsAndFillTimes(
 		if quantity <= 0 {
 			continue
 		}
-		bestCostRaw, method, assocCostRaw, rrRaw, ifValRaw, errC10M := getBestC10M(itemID, quantity, apiResp, metricsMap)
+		// One lookup of the item's API and metrics data serves the C10M, the delta below and the Primary fill time
+		itemIDNorm := BAZAAR_ID(itemID)
+		productData, apiOk := safeGetProductData(apiResp, itemIDNorm)
+		metricsData, metricsOk := safeGetMetricsData(metricsMap, itemIDNorm)
+		bestCostRaw, method, assocCostRaw, rrRaw, ifValRaw, errC10M := getBestC10MFromData(itemIDNorm, quantity, productData, apiOk, metricsData, metricsOk)
 
 		ingredientDetail := BaseIngredientDetail{
 			Quantity: quantity, Method: "N/A", BestCost: toJSONFloat64(math.NaN()), AssociatedCost: toJSONFloat64(math.NaN()),
@@ -124,9 +126,8 @@ func calculateDetailedCostsAndFillTimes(
 				ingredientDetail.IF = toJSONFloat64(valueOrNaN(ifValRaw))
 			}
 		}
-		metricsDataForDelta, metricsOkForDelta := safeGetMetricsData(metricsMap, itemID)
-		if metricsOkForDelta {
-			deltaValRaw := metricsDataForDelta.SellSize*metricsDataForDelta.SellFrequency - metricsDataForDelta.OrderSize*metricsDataForDelta.OrderFrequency
+		if metricsOk {
+			deltaValRaw := metricsData.SellSize*metricsData.SellFrequency - metricsData.OrderSize*metricsData.OrderFrequency
 			ingredientDetail.Delta = toJSONFloat64(valueOrNaN(deltaValRaw))
 		}
 		detailedMapOutput[itemID] = ingredientDetail
@@ -134,9 +135,8 @@ func calculateDetailedCostsAndFillTimes(
 		// Fill Time Calculation for Primary method
 		buyTimeRaw := 0.0 // Default for non-Primary or calculable zero time
 		if method == "Primary" {
-			metricsDataForFill, metricsOkForFill := safeGetMetricsData(metricsMap, itemID)
-			if metricsOkForFill {
-				calculatedTime, _, buyErr := calculateBuyOrderFillTime(itemID, quantity, metricsDataForFill)
+			if metricsOk {
+				calculatedTime, _, buyErr := calculateBuyOrderFillTime(itemID, quantity, metricsData)
 				if buyErr == nil && !math.IsNaN(calculatedTime) && !math.IsInf(calculatedTime, 0) && calculatedTime >= 0 {
 					buyTimeRaw = calculatedTime
 				} else {
@@ -213,9 +213,15 @@ func PerformDualExpansion(
 	}
 	result.TopLevelInstasellTimeSeconds = toJSONFloat64(valueOrNaN(instaSellTimeRaw))
 
-	sellP := getSellPrice(apiResp, itemNameNorm)
-	buyP := getBuyPrice(apiResp, itemNameNorm)
+	// Prices come from the product data looked up above (zero value if missing, giving 0.0 like getSellPrice/getBuyPrice)
+	sellP := productSellPrice(topLevelProductData)
+	buyP := productBuyPrice(topLevelProductData)
 	metricsP := getMetrics(metricsMap, itemNameNorm)
+	// Top-level Delta (NaN without metrics), shared by every branch that reports the item as a base ingredient
+	topDeltaRaw := math.NaN()
+	if metricsP.ProductID != "" {
+		topDeltaRaw = metricsP.SellSize*metricsP.SellFrequency - metricsP.OrderSize*metricsP.OrderFrequency
+	}
 	topC10mPrimRaw, topC10mSecRaw, topIFRaw, topRRRaw, _, _, errTopC10M := calculateC10MInternal(itemNameNorm, quantity, sellP, buyP, metricsP)
 
 	result.PrimaryBased.TopLevelCost = toJSONFloat64(valueOrNaN(topC10mPrimRaw))
@@ -227,14 +233,7 @@ func PerformDualExpansion(
 	}
 	validTopC10mSec := errTopC10M == nil && !math.IsInf(topC10mSecRaw, 0) && !math.IsNaN(topC10mSecRaw) && topC10mSecRaw >= 0
 
-	topLevelRecipeExists := false
-	var topLevelRecipeCheckErr error
-	filePath := filepath.Join(itemFilesDir, itemNameNorm+".json")
-	if _, statErr := os.Stat(filePath); statErr == nil {
-		topLevelRecipeExists = true
-	} else if !os.IsNotExist(statErr) {
-		topLevelRecipeCheckErr = fmt.Errorf("checking recipe file '%s': %w", filePath, statErr)
-	}
+	topLevelRecipeExists, topLevelRecipeCheckErr := hasRecipeFile(itemFilesDir, itemNameNorm)
 
 	if topLevelRecipeCheckErr != nil {
 		errMsg := fmt.Sprintf("Failed to check top-level recipe: %v", topLevelRecipeCheckErr)
@@ -282,7 +281,9 @@ func PerformDualExpansion(
 			craftErrMsg = "Expansion to tree resulted in nil root node"
 			craftRecipeTree = &CraftingStepNode{ItemName: itemNameNorm, QuantityNeeded: quantity, ErrorMessage: craftErrMsg, IsBaseComponent: true, Acquisition: &baseAcqTreeError, Depth: 0, MaxSubTreeDepth: 0}
 		} else {
-			if craftRecipeTree.IsBaseComponent && strings.Contains(craftRecipeTree.ErrorMessage, "Cycle detected to top-level item") {
+			// Single pass over the tree: the same base ingredient map feeds the analysis and the results
+			baseIngredientsFromCraft = extractBaseIngredientsFromTree(craftRecipeTree)
+			if craftRecipeTree.topLevelCycle {
 				craftResultedInCycle = true
 				if craftErrMsg == "" {
 					craftErrMsg = "Expansion resulted in top-level cycle"
@@ -294,7 +295,7 @@ func PerformDualExpansion(
 				craftSlowestFillTimeRaw = math.Inf(1)
 			} else {
 				var analysisErrorMsg string
-				costToCraftOptimalRaw, craftSlowestFillTimeRaw, craftSlowestIngName, craftSlowestIngQty, craftPossible, analysisErrorMsg = analyzeTreeForCostsAndTimes(craftRecipeTree, apiResp, metricsMap)
+				costToCraftOptimalRaw, craftSlowestFillTimeRaw, craftSlowestIngName, craftSlowestIngQty, craftPossible, analysisErrorMsg = analyzeTreeForCostsAndTimes(craftRecipeTree, baseIngredientsFromCraft, apiResp, metricsMap)
 				if !craftPossible {
 					if craftErrMsg == "" {
 						craftErrMsg = "Failed to calculate detailed costs/times from tree"
@@ -306,7 +307,6 @@ func PerformDualExpansion(
 					dlog("  Cost to Craft (from Tree) for %s: %.2f. Slowest Ing: %s (Qty: %.2f, TimeRaw: %.2f)", itemNameNorm, costToCraftOptimalRaw, craftSlowestIngName, craftSlowestIngQty, craftSlowestFillTimeRaw)
 				}
 			}
-			baseIngredientsFromCraft = extractBaseIngredientsFromTree(craftRecipeTree)
 		}
 	} else { // No recipe file exists
 		craftErrMsg = "No recipe found for top-level item."
@@ -389,11 +389,8 @@ func PerformDualExpansion(
 
 		if chosenMethodP1 == "Primary" {
 			acqCostRawVal, acqMethod, acqAssocCostRawVal, acqRRRawVal, acqIFRawVal = topC10mPrimRaw, "Primary", sellP*quantity, topRRRaw, topIFRaw
-			acqDeltaRawVal = math.NaN() // Initialize
+			acqDeltaRawVal = topDeltaRaw
 			if metricsP.ProductID != "" {
-				acqDeltaRawVal = metricsP.SellSize*metricsP.SellFrequency - metricsP.OrderSize*metricsP.OrderFrequency
-			}
-			if metricsP.ProductID != "" { // Check again for fill time specifically
 				fillTimeVal, _, errFill := calculateBuyOrderFillTime(itemNameNorm, quantity, metricsP)
 				if errFill == nil && !math.IsNaN(fillTimeVal) && !math.IsInf(fillTimeVal, 0) && fillTimeVal >= 0 {
 					fillTimeForBaseRawVal = fillTimeVal
@@ -404,10 +401,7 @@ func PerformDualExpansion(
 		} else { // Secondary
 			acqCostRawVal, acqMethod, acqAssocCostRawVal = topC10mSecRaw, "Secondary", sellP*quantity
 			acqRRRawVal, acqIFRawVal = math.NaN(), math.NaN()
-			acqDeltaRawVal = math.NaN()
-			if metricsP.ProductID != "" {
-				acqDeltaRawVal = metricsP.SellSize*metricsP.SellFrequency - metricsP.OrderSize*metricsP.OrderFrequency
-			}
+			acqDeltaRawVal = topDeltaRaw
 			res1.FinalCostMethod = "FixedTopLevelSecondary"
 			res1.TotalCost = toJSONFloat64(valueOrNaN(topC10mSecRaw))
 			fillTimeForBaseRawVal = 0.0 // Instabuy is instant
@@ -439,13 +433,9 @@ func PerformDualExpansion(
 			res1.ErrorMessage += "; Craft Err: " + craftErrMsg
 		}
 
-		acqDeltaUnobtainableRaw := math.NaN()
-		if metricsP.ProductID != "" {
-			acqDeltaUnobtainableRaw = metricsP.SellSize*metricsP.SellFrequency - metricsP.OrderSize*metricsP.OrderFrequency
-		}
 		baseAcqUnobtainable := BaseIngredientDetail{
 			Quantity: quantity, Method: "N/A", BestCost: toJSONFloat64(math.NaN()), AssociatedCost: toJSONFloat64(math.NaN()),
-			RR: toJSONFloat64(math.NaN()), IF: toJSONFloat64(math.NaN()), Delta: toJSONFloat64(valueOrNaN(acqDeltaUnobtainableRaw)),
+			RR: toJSONFloat64(math.NaN()), IF: toJSONFloat64(math.NaN()), Delta: toJSONFloat64(valueOrNaN(topDeltaRaw)),
 		}
 
 		if includeTreeInExpansionResult {
@@ -539,13 +529,9 @@ func PerformDualExpansion(
 		res2.TopLevelAction = "TreatedAsBase"
 		res2.TotalCost = toJSONFloat64(valueOrNaN(topC10mPrimRaw))
 		res2.FinalCostMethod = "FixedTopLevelPrimary"
-		acqDeltaP2PrimRaw := math.NaN()
-		if metricsP.ProductID != "" {
-			acqDeltaP2PrimRaw = metricsP.SellSize*metricsP.SellFrequency - metricsP.OrderSize*metricsP.OrderFrequency
-		}
 		currentBaseDetailP2PrimMethod := BaseIngredientDetail{
 			Quantity: quantity, BestCost: toJSONFloat64(valueOrNaN(topC10mPrimRaw)), AssociatedCost: toJSONFloat64(valueOrNaN(sellP * quantity)), Method: "Primary",
-			RR: toJSONFloat64(valueOrNaN(topRRRaw)), IF: toJSONFloat64(valueOrNaN(topIFRaw)), Delta: toJSONFloat64(valueOrNaN(acqDeltaP2PrimRaw)),
+			RR: toJSONFloat64(valueOrNaN(topRRRaw)), IF: toJSONFloat64(valueOrNaN(topIFRaw)), Delta: toJSONFloat64(valueOrNaN(topDeltaRaw)),
 		}
 		res2.BaseIngredients = map[string]BaseIngredientDetail{itemNameNorm: currentBaseDetailP2PrimMethod}
 		if includeTreeInExpansionResult {
@@ -577,11 +563,7 @@ func PerformDualExpansion(
 					res2.RecipeTree.ErrorMessage += "; " + res2.ErrorMessage
 				}
 			} else {
-				acqDeltaP2NARaw := math.NaN()
-				if metricsP.ProductID != "" {
-					acqDeltaP2NARaw = metricsP.SellSize*metricsP.SellFrequency - metricsP.OrderSize*metricsP.OrderFrequency
-				}
-				baseAcqP2NA := BaseIngredientDetail{Quantity: quantity, Method: "N/A", BestCost: toJSONFloat64(math.NaN()), AssociatedCost: toJSONFloat64(math.NaN()), RR: toJSONFloat64(math.NaN()), IF: toJSONFloat64(math.NaN()), Delta: toJSONFloat64(valueOrNaN(acqDeltaP2NARaw))}
+				baseAcqP2NA := BaseIngredientDetail{Quantity: quantity, Method: "N/A", BestCost: toJSONFloat64(math.NaN()), AssociatedCost: toJSONFloat64(math.NaN()), RR: toJSONFloat64(math.NaN()), IF: toJSONFloat64(math.NaN()), Delta: toJSONFloat64(valueOrNaN(topDeltaRaw))}
 				res2.RecipeTree = &CraftingStepNode{ItemName: itemNameNorm, QuantityNeeded: quantity, IsBaseComponent: true, ErrorMessage: res2.ErrorMessage, Acquisition: &baseAcqP2NA, Depth: 0, MaxSubTreeDepth: 0}
 			}
 		}
@@ -92,3 +92,28 @@ func TestCalculateBuyOrderFillTime_NoOrderFlow(t *testing.T) {
 		t.Fatalf("expected +Inf fill time, got %v", fillTime)
 	}
 }
+
+func TestRelistRate(t *testing.T) {
+	cases := []struct {
+		name    string
+		qty     float64
+		ifValue float64
+		want    float64
+	}{
+		{"exact multiple", 100, 25, 4},
+		{"rounds partial cycle up", 101, 25, 5},
+		{"fills within one cycle", 10, 25, 1},
+		{"infinite insta-fills is one cycle", 10, math.Inf(1), 1},
+		{"no insta-fills never fills", 10, 0, math.Inf(1)},
+		{"NaN IF never fills", 10, math.NaN(), math.Inf(1)},
+		{"NaN quantity never fills", math.NaN(), 25, math.Inf(1)},
+	}
+
+	for _, c := range cases {
+		t.Run(c.name, func(t *testing.T) {
+			if got := relistRate(c.qty, c.ifValue); got != c.want {
+				t.Fatalf("relistRate(%v, %v) = %v, want %v", c.qty, c.ifValue, got, c.want)
+			}
+		})
+	}
+}
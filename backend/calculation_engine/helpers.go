@@ -1,12 +1,9 @@
 package main
 
 import (
-	"encoding/json"
 	"fmt"
 	"log"
 	"math"
-	"os"
-	"path/filepath"
 )
 
 // --- Level Cost Calculation ---
@@ -69,72 +66,36 @@ func expandSingleItemOneLevel(
 	itemFilesDir string,
 ) (map[string]float64, float64, bool, error) {
 
-	filePath := filepath.Join(itemFilesDir, itemName+".json")
-	if _, err := os.Stat(filePath); os.IsNotExist(err) {
-		dlog("expandSingleItemOneLevel: No recipe file for %s", itemName)
-		return nil, 1.0, false, nil // No file = cannot expand
-	} else if err != nil {
-		return nil, 1.0, false, fmt.Errorf("checking recipe file '%s': %w", filePath, err)
-	}
-
-	data, err := os.ReadFile(filePath)
+	recipe, exists, err := loadCraftingRecipe(itemFilesDir, itemName)
 	if err != nil {
-		return nil, 1.0, false, fmt.Errorf("reading recipe file '%s': %w", filePath, err)
-	}
-
-	var item Item
-	if err := json.Unmarshal(data, &item); err != nil {
-		log.Printf("WARN: Failed to parse JSON for '%s' in expandSingleItemOneLevel. Error: %v", itemName, err)
-		return nil, 1.0, false, fmt.Errorf("parsing JSON for '%s': %w", itemName, err)
-	}
-
-	var chosenRecipeCells map[string]string
-	var craftedAmount float64 = 1.0
-	recipeContentFound := false
-
-	if len(item.Recipes) > 0 {
-		firstRecipe := item.Recipes[0]
-		tempCells := map[string]string{"A1": firstRecipe.A1, "A2": firstRecipe.A2, "A3": firstRecipe.A3, "B1": firstRecipe.B1, "B2": firstRecipe.B2, "B3": firstRecipe.B3, "C1": firstRecipe.C1, "C2": firstRecipe.C2, "C3": firstRecipe.C3}
-		hasContent := false
-		for _, v := range tempCells {
-			if v != "" {
-				hasContent = true
-				break
-			}
-		}
-		if hasContent {
-			chosenRecipeCells = tempCells
-			if firstRecipe.Count > 0 {
-				craftedAmount = float64(firstRecipe.Count)
-			}
-			recipeContentFound = true
-			dlog("  Using 'recipes' array[0] for '%s'.", itemName)
+		if exists {
+			log.Printf("WARN: Failed to load recipe for '%s' in expandSingleItemOneLevel. Error: %v", itemName, err)
 		}
+		return nil, 1.0, false, err
 	}
-
-	if !recipeContentFound && (item.Recipe.A1 != "" || item.Recipe.A2 != "" || item.Recipe.A3 != "" || item.Recipe.B1 != "" || item.Recipe.B2 != "" || item.Recipe.B3 != "" || item.Recipe.C1 != "" || item.Recipe.C2 != "" || item.Recipe.C3 != "") {
-		chosenRecipeCells = map[string]string{"A1": item.Recipe.A1, "A2": item.Recipe.A2, "A3": item.Recipe.A3, "B1": item.Recipe.B1, "B2": item.Recipe.B2, "B3": item.Recipe.B3, "C1": item.Recipe.C1, "C2": item.Recipe.C2, "C3": item.Recipe.C3}
-		if item.Recipe.Count > 0 {
-			craftedAmount = float64(item.Recipe.Count)
-		}
-		recipeContentFound = true
-		dlog("  Using 'recipe' object for '%s'.", itemName)
+	if !exists {
+		dlog("expandSingleItemOneLevel: No recipe file for %s", itemName)
+		return nil, 1.0, false, nil // No file = cannot expand
 	}
 
-	if !recipeContentFound {
+	// Recipe choice and cell aggregation are shared with the tree expansion, see resolveCraftingRecipe.
+	if !recipe.hasContent {
 		dlog("expandSingleItemOneLevel: No usable recipe content for '%s'.", itemName)
 		return nil, 1.0, false, nil
 	}
-
-	ingredientsInOneCraft, err := aggregateCells(chosenRecipeCells)
-	if err != nil {
-		return nil, craftedAmount, false, fmt.Errorf("parsing recipe cells for '%s': %w", itemName, err)
+	craftedAmount := recipe.craftedAmount
+	if recipe.cellsErr != nil {
+		return nil, craftedAmount, false, fmt.Errorf("parsing recipe cells for '%s': %w", itemName, recipe.cellsErr)
 	}
-	if len(ingredientsInOneCraft) == 0 {
+	if len(recipe.ingredientsPerCraft) == 0 {
 		dlog("expandSingleItemOneLevel: Recipe for '%s' yields zero ingredients.", itemName)
 		return nil, craftedAmount, false, nil
 	}
 
+	ingredientsInOneCraft := make(map[string]float64, len(recipe.ingredientsPerCraft))
+	for _, ing := range recipe.ingredientsPerCraft {
+		ingredientsInOneCraft[ing.itemID] = ing.quantity
+	}
 	return ingredientsInOneCraft, craftedAmount, true, nil // Success, was expanded
 }
 
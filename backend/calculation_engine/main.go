@@ -475,6 +475,18 @@ func runSingleOptimizationAndUpdateResults() {
 		return
 	}
 
+	// Start the bazaar fetch now so the network round trip overlaps with parsing the metrics below.
+	// The channel is buffered so the goroutine never blocks if we return early on a metrics error.
+	type apiFetchResult struct {
+		resp *HypixelAPIResponse
+		err  error
+	}
+	apiResultCh := make(chan apiFetchResult, 1)
+	go func() {
+		resp, err := getApiResponse() // getApiResponse from api.go
+		apiResultCh <- apiFetchResult{resp: resp, err: err}
+	}()
+
 	productMetrics, parseErr := parseProductMetricsData(currentMetricsBytes)
 	if parseErr != nil {
 		newStatus := fmt.Sprintf("Optimization skipped at %s: Metrics parsing failed: %v", time.Now().Format(time.RFC3339), parseErr)
@@ -494,7 +506,8 @@ func runSingleOptimizationAndUpdateResults() {
 		return
 	}
 
-	apiResp, apiErr := getApiResponse() // getApiResponse from api.go
+	apiResult := <-apiResultCh
+	apiResp, apiErr := apiResult.resp, apiResult.err
 	if apiErr != nil {
 		newStatus := fmt.Sprintf("Optimization skipped at %s: API data load failed: %v", time.Now().Format(time.RFC3339), apiErr)
 		optimizationStatusMutex.Lock()
@@ -815,6 +828,17 @@ func main() {
 	}
 	metricsDataMutex.Unlock()
 
+	// Warm the recipe cache while the initial metrics download and optimization delays run
+	go func() {
+		preloadStart := time.Now()
+		count, err := preloadRecipeCache(itemFilesDir)
+		if err != nil {
+			log.Printf("Main: Recipe cache preload failed: %v", err)
+			return
+		}
+		log.Printf("Main: Preloaded %d recipes into cache in %v", count, time.Since(preloadStart))
+	}()
+
 	// Start periodic tasks
 	go downloadMetricsPeriodically()
 	go optimizePeriodically()
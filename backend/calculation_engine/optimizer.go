@@ -5,7 +5,10 @@ import (
 	"fmt"
 	"log"
 	"math"
+	"os"
 	"sort"
+	"strconv"
+	"sync"
 )
 
 // OptimizedItemResult uses JSONFloat64 for NaN-able fields
@@ -34,6 +37,9 @@ func safeGetP1Error(dr *DualExpansionResult) string {
 	return dr.PrimaryBased.ErrorMessage
 }
 
+// findMaxQuantityForTimeConstraint binary searches for the largest quantity whose total cycle
+// time fits maxAllowedFillTime. It also returns the expansion result computed for that quantity
+// (nil if none is feasible), so the caller doesn't have to expand it again.
 func findMaxQuantityForTimeConstraint(
 	itemName string,
 	maxAllowedFillTime float64,
@@ -41,13 +47,13 @@ func findMaxQuantityForTimeConstraint(
 	metricsMap map[string]ProductMetrics,
 	itemFilesDir string,
 	maxPossibleQty float64, // This is the initial upper bound for the search
-) (float64, error) {
+) (float64, *DualExpansionResult, error) {
 	itemNameNorm := BAZAAR_ID(itemName)
 	dlog("Optimizer: Finding max quantity for %s (Total Cycle Time Constraint: %.2f s, Initial Max Search Qty: %.2f)", itemNameNorm, maxAllowedFillTime, maxPossibleQty)
 
 	if maxPossibleQty < 1.0 {
 		dlog("  Optimizer Search: maxPossibleQty (%.2f) is less than 1. Cannot find feasible quantity. Returning 0.", maxPossibleQty)
-		return 0.0, nil // No search possible or meaningful if upper bound is less than 1
+		return 0.0, nil, nil // No search possible or meaningful if upper bound is less than 1
 	}
 
 	low := 1.0
@@ -56,7 +62,8 @@ func findMaxQuantityForTimeConstraint(
 		high = low
 	}
 
-	bestQty := 0.0 // Stores the highest quantity found so far that meets the time constraint
+	bestQty := 0.0                      // Stores the highest quantity found so far that meets the time constraint
+	var bestResult *DualExpansionResult // Expansion result at bestQty
 	iterations := 0
 	const maxIterations = 50 // Limit iterations to prevent infinite loops in edge cases
 
@@ -80,8 +87,9 @@ func findMaxQuantityForTimeConstraint(
 
 		dlog("  Optimizer Search: Iter %d, Low=%.0f, High=%.0f, Testing MidQty=%.0f for %s", iterations, low, high, midQty, itemNameNorm)
 
-		// Call PerformDualExpansion with includeTreeInExpansionResult = false (RAM Optimization)
-		dualResult, err := PerformDualExpansion(itemNameNorm, midQty, apiResp, metricsMap, itemFilesDir, false)
+		// Include the tree so the result at the best quantity can be used as the final expansion;
+		// the tree is built either way, and only the current best result is kept alive.
+		dualResult, err := PerformDualExpansion(itemNameNorm, midQty, apiResp, metricsMap, itemFilesDir, true)
 		if err != nil {
 			dlog("  Optimizer Search: Error in PerformDualExpansion for %s Qty %.0f: %v. Assuming time constraint exceeded (treat as too high).", itemNameNorm, midQty, err)
 			high = midQty - 1 // Treat error as if it's too slow/costly
@@ -109,13 +117,14 @@ func findMaxQuantityForTimeConstraint(
 
 		if totalEffectiveTime <= maxAllowedFillTime && totalEffectiveTime >= 0 { // Check if it meets the constraint (and not negative infinity)
 			bestQty = midQty // This quantity is feasible
+			bestResult = dualResult
 			low = midQty + 1 // Try for a higher quantity
 		} else { // Time constraint exceeded or invalid time
 			high = midQty - 1 // Quantity is too high, try lower
 		}
 	}
 	dlog("Optimizer: Best feasible quantity for %s (Total Cycle Time Constraint %.2f s): %.0f (after %d iterations)", itemNameNorm, maxAllowedFillTime, bestQty, iterations)
-	return sanitizeFloat(bestQty), nil // SanitizeFloat will handle NaN/Inf if bestQty remained 0.0 (which is fine)
+	return sanitizeFloat(bestQty), bestResult, nil // SanitizeFloat will handle NaN/Inf if bestQty remained 0.0 (which is fine)
 }
 
 func optimizeItemProfit(
@@ -144,7 +153,7 @@ func optimizeItemProfit(
 	}
 
 	// Step 1: Find the maximum feasible quantity under the time constraint
-	maxFeasibleQty, errFeasible := findMaxQuantityForTimeConstraint(itemNameNorm, maxAllowedFillTime, apiResp, metricsMap, itemFilesDir, maxPossibleInitialQty)
+	maxFeasibleQty, dualResultFinal, errFeasible := findMaxQuantityForTimeConstraint(itemNameNorm, maxAllowedFillTime, apiResp, metricsMap, itemFilesDir, maxPossibleInitialQty)
 	if errFeasible != nil {
 		result.ErrorMessage = fmt.Sprintf("Error finding max feasible quantity: %v", errFeasible)
 		// If findMaxQuantityForTimeConstraint itself errors, we might not have a qty.
@@ -246,18 +255,8 @@ func optimizeItemProfit(
 		return result // Return with Qty 1 context
 	}
 
-	// Step 3: Max feasible quantity > 0. Perform final expansion for this quantity.
-	dlog("Optimizer: Max feasible quantity for %s is %.2f. Performing final expansion.", itemNameNorm, result.MaxFeasibleQuantity)
-	// Call PerformDualExpansion with includeTreeInExpansionResult = true to get MaxRecipeDepth
-	dualResultFinal, errExpansionFinal := PerformDualExpansion(itemNameNorm, result.MaxFeasibleQuantity, apiResp, metricsMap, itemFilesDir, true)
-
-	if errExpansionFinal != nil {
-		result.ErrorMessage = fmt.Sprintf("Error performing dual expansion for optimal qty %.2f: %v", result.MaxFeasibleQuantity, errExpansionFinal)
-		if dualResultFinal != nil && dualResultFinal.PrimaryBased.RecipeTree != nil { // Still try to get depth
-			result.MaxRecipeDepth = dualResultFinal.PrimaryBased.RecipeTree.MaxSubTreeDepth
-		}
-		return result
-	}
+	// Step 3: Max feasible quantity > 0. Use the expansion the search already performed for this quantity.
+	dlog("Optimizer: Max feasible quantity for %s is %.2f. Using its expansion from the search.", itemNameNorm, result.MaxFeasibleQuantity)
 	if dualResultFinal == nil { // Should not happen if no error, but defensive
 		result.ErrorMessage = fmt.Sprintf("Dual expansion returned nil for optimal qty %.2f without error.", result.MaxFeasibleQuantity)
 		return result
@@ -340,6 +339,24 @@ func optimizeItemProfit(
 	return result
 }
 
+// optimizerWorkerCount returns how many items RunFullOptimization optimizes concurrently:
+// OPTIMIZER_WORKERS if set to a positive integer, otherwise 1, capped at the item count.
+// Parallelism is opt-in because the caller already throttles with ITEMS_PER_CHUNK and
+// PAUSE_MS_BETWEEN_CHUNKS, and each worker holds its own recipe trees, so peak memory grows
+// with the worker count.
+func optimizerWorkerCount(itemCount int) int {
+	workers := 1
+	if owStr := os.Getenv("OPTIMIZER_WORKERS"); owStr != "" {
+		if val, err := strconv.Atoi(owStr); err == nil && val > 0 {
+			workers = val
+		}
+	}
+	if workers > itemCount {
+		workers = itemCount
+	}
+	return workers
+}
+
 func RunFullOptimization(
 	itemIDs []string,
 	maxAllowedFillTime float64, // Max total cycle time (acquisition + sale)
@@ -367,21 +384,20 @@ func RunFullOptimization(
 		return results // Return empty slice, not an error
 	}
 
-	for i, itemID := range itemIDs {
+	optimizeOne := func(i int, itemID string) OptimizedItemResult {
 		dlog("Optimizer: Optimizing item %d/%d: %s", i+1, len(itemIDs), itemID)
 		normalizedID := BAZAAR_ID(itemID) // Normalize ID
 
 		// Check if item exists in API data (quick sanity check)
 		if _, exists := apiResp.Products[normalizedID]; !exists {
 			dlog("Optimizer: Item %s (Normalized: %s) not found in API product list for this run, skipping.", itemID, normalizedID)
-			results = append(results, OptimizedItemResult{
+			return OptimizedItemResult{
 				ItemName: normalizedID, CalculationPossible: false, ErrorMessage: "Item not found in current Bazaar API data.",
 				MaxFeasibleQuantity: 0,
 				CostAtOptimalQty:    toJSONFloat64(math.NaN()), RevenueAtOptimalQty: toJSONFloat64(math.NaN()), MaxProfit: toJSONFloat64(math.NaN()),
 				TotalCycleTimeAtOptimalQty: toJSONFloat64(math.NaN()), AcquisitionTimeAtOptimalQty: toJSONFloat64(math.NaN()), SaleTimeAtOptimalQty: toJSONFloat64(math.NaN()),
 				RecipeTree: nil, // Ensure nil
-			})
-			continue
+			}
 		}
 
 		currentMaxInitialQty := maxPossibleInitialQtyPerItem
@@ -391,9 +407,28 @@ func RunFullOptimization(
 		}
 
 		// optimizeItemProfit now handles RAM for RecipeTree internally
-		result := optimizeItemProfit(normalizedID, maxAllowedFillTime, apiResp, metricsMap, itemFilesDir, currentMaxInitialQty)
-		results = append(results, result)
+		return optimizeItemProfit(normalizedID, maxAllowedFillTime, apiResp, metricsMap, itemFilesDir, currentMaxInitialQty)
+	}
+
+	// Items are independent and only read apiResp/metricsMap and the (locked) recipe cache, so they are
+	// optimized on a worker pool. Each result goes to its item's index, keeping the pre-sort order stable.
+	results = make([]OptimizedItemResult, len(itemIDs))
+	indices := make(chan int)
+	var wg sync.WaitGroup
+	for w := 0; w < optimizerWorkerCount(len(itemIDs)); w++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for i := range indices {
+				results[i] = optimizeOne(i, itemIDs[i])
+			}
+		}()
+	}
+	for i := range itemIDs {
+		indices <- i
 	}
+	close(indices)
+	wg.Wait()
 
 	// Sort results: CalculationPossible=true first, then by MaxProfit descending.
 	sort.Slice(results, func(i, j int) bool {
@@ -1,6 +1,19 @@
 // recipe.go
 package main
 
+import (
+	"encoding/json"
+	"fmt"
+	"os"
+	"path/filepath"
+	"runtime"
+	"sort"
+	"strings"
+	"sync"
+	"sync/atomic"
+	"time"
+)
+
 // Item struct definitions remain here as they describe the recipe file format.
 
 type Recipe struct {
@@ -38,11 +51,192 @@ type Item struct {
 	Recipes []Recipe     `json:"recipes"`        // Preferred: an array of possible recipes
 }
 
-// ItemStep is used for cycle detection path tracking during recursive expansion.
-// It stores the item name (normalized) and the quantity being processed at that step.
-type ItemStep struct {
-	name     string  // Normalized item ID
-	quantity float64 // Quantity of this item in the path
+// recipeIngredient is one distinct ingredient of a crafting recipe and its amount per craft.
+type recipeIngredient struct {
+	itemID   string  // Normalized item ID
+	quantity float64 // Amount needed per craft
+}
+
+// craftingRecipe is the recipe an item is expanded with: the first 'recipes' entry with any
+// filled cell, falling back to the single 'recipe' object, aggregated into normalized
+// ingredient amounts per craft.
+type craftingRecipe struct {
+	ingredientsPerCraft []recipeIngredient // Sorted by item ID so expansion order is deterministic
+	craftedAmount       float64
+	hasContent          bool  // False if neither recipe form has a filled cell
+	cellsErr            error // First error from aggregateCells, if any cell could not be parsed
+}
+
+// gridCells returns the recipe's cells in recipeGridPositions order.
+func (r Recipe) gridCells() [len(recipeGridPositions)]string {
+	return [...]string{r.A1, r.A2, r.A3, r.B1, r.B2, r.B3, r.C1, r.C2, r.C3}
+}
+
+// gridCells returns the recipe's cells in recipeGridPositions order.
+func (r SingleRecipe) gridCells() [len(recipeGridPositions)]string {
+	return [...]string{r.A1, r.A2, r.A3, r.B1, r.B2, r.B3, r.C1, r.C2, r.C3}
+}
+
+// filledCellsByPosition maps the non-empty cells to their grid position, or returns nil if all are empty.
+func filledCellsByPosition(cells [len(recipeGridPositions)]string) map[string]string {
+	var byPosition map[string]string
+	for i, content := range cells {
+		if content == "" {
+			continue
+		}
+		if byPosition == nil {
+			byPosition = make(map[string]string, len(cells))
+		}
+		byPosition[recipeGridPositions[i]] = content
+	}
+	return byPosition
+}
+
+// resolveCraftingRecipe chooses and aggregates the recipe used to craft item.
+func resolveCraftingRecipe(item *Item) *craftingRecipe {
+	resolved := &craftingRecipe{craftedAmount: 1.0}
+
+	var chosenRecipeCells map[string]string
+	if len(item.Recipes) > 0 {
+		firstRecipe := item.Recipes[0]
+		if chosenRecipeCells = filledCellsByPosition(firstRecipe.gridCells()); chosenRecipeCells != nil && firstRecipe.Count > 0 {
+			resolved.craftedAmount = float64(firstRecipe.Count)
+		}
+	}
+	if chosenRecipeCells == nil {
+		if chosenRecipeCells = filledCellsByPosition(item.Recipe.gridCells()); chosenRecipeCells != nil && item.Recipe.Count > 0 {
+			resolved.craftedAmount = float64(item.Recipe.Count)
+		}
+	}
+	resolved.hasContent = chosenRecipeCells != nil
+
+	if resolved.hasContent {
+		var aggregated map[string]float64
+		aggregated, resolved.cellsErr = aggregateCells(chosenRecipeCells)
+		resolved.ingredientsPerCraft = make([]recipeIngredient, 0, len(aggregated))
+		for itemID, quantity := range aggregated {
+			resolved.ingredientsPerCraft = append(resolved.ingredientsPerCraft, recipeIngredient{itemID: itemID, quantity: quantity})
+		}
+		sort.Slice(resolved.ingredientsPerCraft, func(i, j int) bool {
+			return resolved.ingredientsPerCraft[i].itemID < resolved.ingredientsPerCraft[j].itemID
+		})
+	}
+	return resolved
+}
+
+// recipeCacheEntry is a parsed recipe file along with the modification time it was parsed at
+// and the crafting recipe resolved from it.
+type recipeCacheEntry struct {
+	modTime time.Time
+	item    *Item
+	recipe  *craftingRecipe
+}
+
+// recipeCache holds parsed recipe files keyed by path. The optimizer expands the same items
+// many times per cycle (every binary search step rebuilds the whole tree), so each file is
+// only read, unmarshaled and resolved again when its modification time changes.
+var (
+	recipeCache      = make(map[string]recipeCacheEntry)
+	recipeCacheMutex sync.RWMutex
+)
+
+// loadRecipeEntry returns the cache entry for a normalized item ID, parsing the file if needed.
+// exists is false when there is no recipe file; an error with exists == false is a file system
+// error while checking for the file, an error with exists == true means it could not be read or parsed.
+func loadRecipeEntry(itemFilesDir, itemNameNorm string) (entry recipeCacheEntry, exists bool, err error) {
+	filePath := filepath.Join(itemFilesDir, itemNameNorm+".json")
+	info, statErr := os.Stat(filePath)
+	if os.IsNotExist(statErr) {
+		return recipeCacheEntry{}, false, nil
+	} else if statErr != nil {
+		return recipeCacheEntry{}, false, fmt.Errorf("checking recipe file '%s': %w", filePath, statErr)
+	}
+
+	recipeCacheMutex.RLock()
+	entry, found := recipeCache[filePath]
+	recipeCacheMutex.RUnlock()
+	if found && entry.modTime.Equal(info.ModTime()) {
+		return entry, true, nil
+	}
+
+	data, readErr := os.ReadFile(filePath)
+	if readErr != nil {
+		return recipeCacheEntry{}, true, fmt.Errorf("reading recipe file '%s': %w", filePath, readErr)
+	}
+	var parsed Item
+	if err := json.Unmarshal(data, &parsed); err != nil {
+		return recipeCacheEntry{}, true, fmt.Errorf("parsing recipe JSON for '%s': %w", itemNameNorm, err)
+	}
+
+	entry = recipeCacheEntry{modTime: info.ModTime(), item: &parsed, recipe: resolveCraftingRecipe(&parsed)}
+	recipeCacheMutex.Lock()
+	recipeCache[filePath] = entry
+	recipeCacheMutex.Unlock()
+	return entry, true, nil
+}
+
+// loadItemRecipe returns the parsed recipe file for a normalized item ID (see loadRecipeEntry
+// for the meaning of exists and err). The returned Item is shared with the cache and must not be modified.
+func loadItemRecipe(itemFilesDir, itemNameNorm string) (item *Item, exists bool, err error) {
+	entry, exists, err := loadRecipeEntry(itemFilesDir, itemNameNorm)
+	return entry.item, exists, err
+}
+
+// loadCraftingRecipe returns the memoized crafting recipe for a normalized item ID (see
+// loadRecipeEntry for the meaning of exists and err). The result is shared and must not be modified.
+func loadCraftingRecipe(itemFilesDir, itemNameNorm string) (recipe *craftingRecipe, exists bool, err error) {
+	entry, exists, err := loadRecipeEntry(itemFilesDir, itemNameNorm)
+	return entry.recipe, exists, err
+}
+
+// hasRecipeFile reports whether a normalized item ID has a recipe file, going through the recipe
+// cache so the top-level checks warm the same entry the expansion uses. A file that exists but
+// cannot be read or parsed still counts as present; expansion reports that error on the node.
+// The returned error is only set for file system errors while checking for the file.
+func hasRecipeFile(itemFilesDir, itemNameNorm string) (bool, error) {
+	_, exists, err := loadRecipeEntry(itemFilesDir, itemNameNorm)
+	if exists {
+		return true, nil
+	}
+	return false, err
+}
+
+// preloadRecipeCache parses every recipe file in itemFilesDir into the recipe cache using one
+// worker per CPU, so the first optimization cycle does not pay for thousands of sequential
+// reads and unmarshals. Files that fail to load are skipped here and reported by expansion.
+// Returns the number of recipes cached.
+func preloadRecipeCache(itemFilesDir string) (int, error) {
+	entries, err := os.ReadDir(itemFilesDir)
+	if err != nil {
+		return 0, fmt.Errorf("listing recipe directory '%s': %w", itemFilesDir, err)
+	}
+
+	itemIDs := make(chan string)
+	var loaded int64
+	var wg sync.WaitGroup
+	for w := 0; w < runtime.GOMAXPROCS(0); w++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for itemID := range itemIDs {
+				if _, exists, err := loadRecipeEntry(itemFilesDir, itemID); exists && err == nil {
+					atomic.AddInt64(&loaded, 1)
+				} else if err != nil {
+					dlog("preloadRecipeCache: skipping %s: %v", itemID, err)
+				}
+			}
+		}()
+	}
+	for _, entry := range entries {
+		name := entry.Name()
+		if entry.IsDir() || filepath.Ext(name) != ".json" {
+			continue
+		}
+		itemIDs <- strings.TrimSuffix(name, ".json")
+	}
+	close(itemIDs)
+	wg.Wait()
+	return int(loaded), nil
 }
 
 // Note: The old expandItemRecursive and ExpandItem functions were removed from here
@@ -0,0 +1,99 @@
+package main
+
+import (
+	"os"
+	"path/filepath"
+	"testing"
+	"time"
+)
+
+func TestLoadItemRecipe_CachesUntilFileChanges(t *testing.T) {
+	dir := t.TempDir()
+	path := filepath.Join(dir, "TEST_ITEM.json")
+	if err := os.WriteFile(path, []byte(`{"itemid":"TEST_ITEM","recipe":{"A1":"DIAMOND:2","count":1}}`), 0o644); err != nil {
+		t.Fatal(err)
+	}
+
+	first, exists, err := loadItemRecipe(dir, "TEST_ITEM")
+	if err != nil || !exists {
+		t.Fatalf("expected recipe to load, got exists=%v err=%v", exists, err)
+	}
+	second, _, _ := loadItemRecipe(dir, "TEST_ITEM")
+	if first != second {
+		t.Fatalf("expected second load to be served from the cache")
+	}
+
+	if err := os.WriteFile(path, []byte(`{"itemid":"TEST_ITEM","recipe":{"A1":"GOLD_INGOT:3","count":1}}`), 0o644); err != nil {
+		t.Fatal(err)
+	}
+	later := time.Now().Add(time.Minute)
+	if err := os.Chtimes(path, later, later); err != nil {
+		t.Fatal(err)
+	}
+	reloaded, _, err := loadItemRecipe(dir, "TEST_ITEM")
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if reloaded.Recipe.A1 != "GOLD_INGOT:3" {
+		t.Fatalf("expected modified recipe to be re-parsed, got A1=%q", reloaded.Recipe.A1)
+	}
+}
+
+func TestLoadItemRecipe_MissingAndInvalid(t *testing.T) {
+	dir := t.TempDir()
+	if _, exists, err := loadItemRecipe(dir, "MISSING_ITEM"); exists || err != nil {
+		t.Fatalf("expected missing recipe to report exists=false and no error, got exists=%v err=%v", exists, err)
+	}
+
+	if err := os.WriteFile(filepath.Join(dir, "BROKEN_ITEM.json"), []byte(`{not json`), 0o644); err != nil {
+		t.Fatal(err)
+	}
+	if _, exists, err := loadItemRecipe(dir, "BROKEN_ITEM"); !exists || err == nil {
+		t.Fatalf("expected invalid recipe to report exists=true with an error, got exists=%v err=%v", exists, err)
+	}
+}
+
+func TestResolveCraftingRecipe(t *testing.T) {
+	cases := []struct {
+		name        string
+		item        Item
+		wantContent bool
+		wantAmount  float64
+		wantIngs    []recipeIngredient
+	}{
+		{
+			name:        "first recipes entry wins",
+			item:        Item{Recipes: []Recipe{{A1: "DIAMOND:2", B2: "diamond:3", C3: "STICK", Count: 4}}, Recipe: SingleRecipe{A1: "GOLD_INGOT"}},
+			wantContent: true, wantAmount: 4,
+			wantIngs: []recipeIngredient{{itemID: "DIAMOND", quantity: 5}, {itemID: "STICK", quantity: 1}},
+		},
+		{
+			name:        "empty recipes entry falls back to recipe object",
+			item:        Item{Recipes: []Recipe{{Count: 9}}, Recipe: SingleRecipe{C2: "GOLD_INGOT:8"}},
+			wantContent: true, wantAmount: 1,
+			wantIngs: []recipeIngredient{{itemID: "GOLD_INGOT", quantity: 8}},
+		},
+		{
+			name:        "no filled cells",
+			item:        Item{},
+			wantContent: false, wantAmount: 1,
+		},
+	}
+
+	for _, c := range cases {
+		t.Run(c.name, func(t *testing.T) {
+			got := resolveCraftingRecipe(&c.item)
+			if got.hasContent != c.wantContent || got.craftedAmount != c.wantAmount || got.cellsErr != nil {
+				t.Fatalf("got hasContent=%v craftedAmount=%v cellsErr=%v, want %v/%v/nil", got.hasContent, got.craftedAmount, got.cellsErr, c.wantContent, c.wantAmount)
+			}
+			if len(got.ingredientsPerCraft) != len(c.wantIngs) {
+				t.Fatalf("got ingredients %+v, want %+v", got.ingredientsPerCraft, c.wantIngs)
+			}
+			for i, ing := range c.wantIngs {
+				if got.ingredientsPerCraft[i] != ing {
+					t.Fatalf("got ingredients %+v, want %+v", got.ingredientsPerCraft, c.wantIngs)
+				}
+			}
+		})
+	}
+}
@@ -2,12 +2,9 @@
 package main
 
 import (
-	"encoding/json"
 	"fmt"
 	"log"
 	"math"
-	"os"
-	"path/filepath"
 	"strings"
 )
 
@@ -23,18 +20,22 @@ type CraftingStepNode struct {
 	ErrorMessage     string                `json:"error_message,omitempty"`
 	Depth            int                   `json:"depth"`
 	MaxSubTreeDepth  int                   `json:"max_sub_tree_depth"` // Max depth of this node or any of its children
+
+	topLevelCycle bool // Set at build time when this node cycles back to the top-level item
 }
 
-func calculateC10MForNode(itemID string, quantity float64, apiResp *HypixelAPIResponse, metricsMap map[string]ProductMetrics) (
+// calculateC10MForNode returns the best C10M and Delta for an already normalized item ID (every
+// caller passes the node's normalized name).
+func calculateC10MForNode(itemIDNorm string, quantity float64, apiResp *HypixelAPIResponse, metricsMap map[string]ProductMetrics) (
 	cost float64, method string, assocCost float64, rr float64, ifVal float64, delta float64, err error) {
-	// This function directly calls getBestC10M and then adds Delta calculation.
-	// getBestC10M returns: bestCost, bestMethod, associatedCost, rrValue, ifValue, err
-	cost, method, assocCost, rr, ifVal, err = getBestC10M(itemID, quantity, apiResp, metricsMap)
+	// Looks the item up once and shares the metrics between getBestC10MFromData and the Delta calculation.
+	productData, apiOk := safeGetProductData(apiResp, itemIDNorm)
+	metricsData, metricsOk := safeGetMetricsData(metricsMap, itemIDNorm)
+	cost, method, assocCost, rr, ifVal, err = getBestC10MFromData(itemIDNorm, quantity, productData, apiOk, metricsData, metricsOk)
 
 	// Calculate Delta separately as it's not part of getBestC10M's direct return for this purpose.
 	// Delta is more of a property of the item's market dynamics, not strictly part of its acquisition cost.
 	calculatedDelta := math.NaN() // Default to NaN if metrics not found
-	metricsData, metricsOk := safeGetMetricsData(metricsMap, itemID)
 	if metricsOk {
 		calculatedDelta = (metricsData.SellSize * metricsData.SellFrequency) - (metricsData.OrderSize * metricsData.OrderFrequency)
 	}
@@ -44,7 +45,7 @@ func calculateC10MForNode(itemID string, quantity float64, apiResp *HypixelAPIRe
 }
 
 func expandItemRecursiveTree(
-	itemName string, quantityNeeded float64, path []ItemStep, originalTopLevelItemID string, currentDepth int,
+	itemName string, quantityNeeded float64, onPath map[string]bool, originalTopLevelItemID string, currentDepth int,
 	apiResp *HypixelAPIResponse, metricsMap map[string]ProductMetrics, itemFilesDir string,
 ) (*CraftingStepNode, error) { // Returns node and potentially a critical error for the caller
 	itemNameNorm := BAZAAR_ID(itemName)
@@ -55,11 +56,11 @@ func expandItemRecursiveTree(
 		MaxSubTreeDepth: currentDepth, // Initial assumption, will be updated by children
 	}
 
-	// Cycle Detection
-	if isInPath(itemNameNorm, path) {
+	// Cycle Detection: onPath holds the normalized items currently being expanded above this node
+	if onPath[itemNameNorm] {
 		node.IsBaseComponent = true // Treat as base due to cycle
-		isTopLevelCycle := itemNameNorm == originalTopLevelItemID
-		if isTopLevelCycle {
+		node.topLevelCycle = itemNameNorm == originalTopLevelItemID
+		if node.topLevelCycle {
 			node.ErrorMessage = "Cycle detected to top-level item '" + originalTopLevelItemID + "'"
 		} else {
 			node.ErrorMessage = "Cycle detected to intermediate item '" + itemNameNorm + "'"
@@ -88,44 +89,28 @@ func expandItemRecursiveTree(
 		return node, nil // Return the node, cycle is not a critical error for recursion itself
 	}
 
-	// Add current item to path for sub-expansions
-	currentPath := append([]ItemStep{}, path...) // Create a copy of the path
-	currentPath = append(currentPath, ItemStep{name: itemNameNorm, quantity: quantityNeeded})
-
-	// Recipe File Handling
-	filePath := filepath.Join(itemFilesDir, itemNameNorm+".json")
-	recipeFileExists := false
-	var itemData Item // To store parsed recipe data
-
-	if _, statErr := os.Stat(filePath); statErr == nil {
-		recipeFileExists = true
-		data, readErr := os.ReadFile(filePath)
-		if readErr != nil {
-			// Error reading the file, treat as base and record error
-			node.IsBaseComponent = true
-			node.ErrorMessage = fmt.Sprintf("Error reading recipe file '%s': %v", filePath, readErr)
-			// Attempt to get C10M cost even if recipe read fails
-			costR, mR, acR, rrR, ifR, dR, errR := calculateC10MForNode(itemNameNorm, quantityNeeded, apiResp, metricsMap)
-			node.Acquisition = &BaseIngredientDetail{Quantity: quantityNeeded, Method: mR, BestCost: toJSONFloat64(valueOrNaN(costR)), AssociatedCost: toJSONFloat64(valueOrNaN(acR)), RR: toJSONFloat64(valueOrNaN(rrR)), IF: toJSONFloat64(valueOrNaN(ifR)), Delta: toJSONFloat64(valueOrNaN(dR))}
-			if errR != nil && node.Acquisition != nil {
-				node.Acquisition.Method = "ERROR (RecipeReadFail/C10M)"
-			}
-			return node, nil // Not a critical error for recursion, just this node can't expand
-		}
-		if err := json.Unmarshal(data, &itemData); err != nil {
-			// Error parsing JSON, treat as base and record error
-			node.IsBaseComponent = true
-			node.ErrorMessage = fmt.Sprintf("Error parsing recipe JSON for '%s': %v", itemNameNorm, err)
-			costP, mP, acP, rrP, ifP, dP, errP := calculateC10MForNode(itemNameNorm, quantityNeeded, apiResp, metricsMap)
-			node.Acquisition = &BaseIngredientDetail{Quantity: quantityNeeded, Method: mP, BestCost: toJSONFloat64(valueOrNaN(costP)), AssociatedCost: toJSONFloat64(valueOrNaN(acP)), RR: toJSONFloat64(valueOrNaN(rrP)), IF: toJSONFloat64(valueOrNaN(ifP)), Delta: toJSONFloat64(valueOrNaN(dP))}
-			if errP != nil && node.Acquisition != nil {
-				node.Acquisition.Method = "ERROR (RecipeParseFail/C10M)"
-			}
-			return node, nil
+	// Mark current item as on the path for sub-expansions; a single set is shared by the whole
+	// expansion and the item is removed again when this node returns.
+	onPath[itemNameNorm] = true
+	defer delete(onPath, itemNameNorm)
+
+	// Recipe File Handling (parsed and resolved recipes are cached, see loadCraftingRecipe)
+	recipe, recipeFileExists, loadErr := loadCraftingRecipe(itemFilesDir, itemNameNorm)
+	if loadErr != nil {
+		if !recipeFileExists {
+			// This is a more critical file system error
+			return nil, fmt.Errorf("expandItemRecursiveTree: %w", loadErr)
 		}
-	} else if !os.IsNotExist(statErr) { // If os.Stat returned an error other than "not exist"
-		// This is a more critical file system error
-		return nil, fmt.Errorf("expandItemRecursiveTree: error checking recipe file '%s': %w", filePath, statErr)
+		// Error reading or parsing the file, treat as base and record error
+		node.IsBaseComponent = true
+		node.ErrorMessage = fmt.Sprintf("Error loading recipe for '%s': %v", itemNameNorm, loadErr)
+		// Attempt to get C10M cost even if recipe load fails
+		costR, mR, acR, rrR, ifR, dR, errR := calculateC10MForNode(itemNameNorm, quantityNeeded, apiResp, metricsMap)
+		node.Acquisition = &BaseIngredientDetail{Quantity: quantityNeeded, Method: mR, BestCost: toJSONFloat64(valueOrNaN(costR)), AssociatedCost: toJSONFloat64(valueOrNaN(acR)), RR: toJSONFloat64(valueOrNaN(rrR)), IF: toJSONFloat64(valueOrNaN(ifR)), Delta: toJSONFloat64(valueOrNaN(dR))}
+		if errR != nil && node.Acquisition != nil {
+			node.Acquisition.Method = "ERROR (RecipeLoadFail/C10M)"
+		}
+		return node, nil // Not a critical error for recursion, just this node can't expand
 	}
 
 	// Decision to Expand vs. Treat as Base (based on C10M of current item)
@@ -196,34 +181,9 @@ func expandItemRecursiveTree(
 	}
 
 	// --- Expand this item: Process its recipe ---
-	var chosenRecipeCells map[string]string
-	var craftedAmount float64 = 1.0
-	recipeContentExists := false
-
-	// Logic to choose recipe (from Item.Recipes or Item.Recipe) - mirrors expandSingleItemOneLevel in helpers.go
-	if len(itemData.Recipes) > 0 {
-		firstRecipe := itemData.Recipes[0]
-		tempCells := map[string]string{"A1": firstRecipe.A1, "A2": firstRecipe.A2, "A3": firstRecipe.A3, "B1": firstRecipe.B1, "B2": firstRecipe.B2, "B3": firstRecipe.B3, "C1": firstRecipe.C1, "C2": firstRecipe.C2, "C3": firstRecipe.C3}
-		for _, v := range tempCells {
-			if v != "" {
-				recipeContentExists = true
-				break
-			}
-		}
-		if recipeContentExists {
-			chosenRecipeCells = tempCells
-			if firstRecipe.Count > 0 {
-				craftedAmount = float64(firstRecipe.Count)
-			}
-		}
-	}
-	if !recipeContentExists && (itemData.Recipe.A1 != "" || itemData.Recipe.A2 != "" || itemData.Recipe.A3 != "" || itemData.Recipe.B1 != "" || itemData.Recipe.B2 != "" || itemData.Recipe.B3 != "" || itemData.Recipe.C1 != "" || itemData.Recipe.C2 != "" || itemData.Recipe.C3 != "") {
-		chosenRecipeCells = map[string]string{"A1": itemData.Recipe.A1, "A2": itemData.Recipe.A2, "A3": itemData.Recipe.A3, "B1": itemData.Recipe.B1, "B2": itemData.Recipe.B2, "B3": itemData.Recipe.B3, "C1": itemData.Recipe.C1, "C2": itemData.Recipe.C2, "C3": itemData.Recipe.C3}
-		if itemData.Recipe.Count > 0 {
-			craftedAmount = float64(itemData.Recipe.Count)
-		}
-		recipeContentExists = true
-	}
+	// Recipe choice (from Item.Recipes or Item.Recipe) and cell aggregation are memoized per item.
+	recipeContentExists := recipe.hasContent
+	craftedAmount := recipe.craftedAmount
 
 	if !recipeContentExists { // Should not be reached if shouldExpandThisItem is true and recipeFileExists
 		node.IsBaseComponent = true
@@ -241,7 +201,7 @@ func expandItemRecursiveTree(
 	node.NumCrafts = math.Ceil(quantityNeeded / craftedAmount)
 	node.IsBaseComponent = false // Mark as expanded, not base
 
-	ingredientsInOneCraft, aggErr := aggregateCells(chosenRecipeCells)
+	ingredientsInOneCraft, aggErr := recipe.ingredientsPerCraft, recipe.cellsErr
 	if aggErr != nil {
 		node.ErrorMessage = fmt.Sprintf("Error parsing recipe cells for '%s' during expansion: %v", itemNameNorm, aggErr)
 		// This is a problem with the recipe data itself. Node is returned with error.
@@ -268,13 +228,14 @@ func expandItemRecursiveTree(
 
 	// Recursively expand ingredients
 	maxChildSubTreeDepth := currentDepth // Initialize with current depth
-	for ingName, ingAmtPerCraft := range ingredientsInOneCraft {
-		totalIngAmtNeededForParent := ingAmtPerCraft * node.NumCrafts
+	for _, ing := range ingredientsInOneCraft {
+		ingName := ing.itemID
+		totalIngAmtNeededForParent := ing.quantity * node.NumCrafts
 		if totalIngAmtNeededForParent <= 0 { // Should not happen if ingAmtPerCraft > 0
 			continue
 		}
 
-		subNode, errExpandSub := expandItemRecursiveTree(ingName, totalIngAmtNeededForParent, currentPath, originalTopLevelItemID, currentDepth+1, apiResp, metricsMap, itemFilesDir)
+		subNode, errExpandSub := expandItemRecursiveTree(ingName, totalIngAmtNeededForParent, onPath, originalTopLevelItemID, currentDepth+1, apiResp, metricsMap, itemFilesDir)
 
 		if errExpandSub != nil {
 			// A critical error occurred in a sub-expansion (e.g., file system error)
@@ -315,8 +276,11 @@ func ExpandItemToTree(
 	dlog("ExpandItemToTree: Starting expansion for %.2f x %s", quantity, itemNameNorm)
 
 	// Check if recipe file exists. If not, treat as a base component.
-	filePath := filepath.Join(itemFilesDir, itemNameNorm+".json")
-	if _, statErr := os.Stat(filePath); os.IsNotExist(statErr) {
+	recipeExists, checkErr := hasRecipeFile(itemFilesDir, itemNameNorm)
+	if checkErr != nil { // File system error while checking
+		return nil, fmt.Errorf("ExpandItemToTree: %w", checkErr)
+	}
+	if !recipeExists {
 		dlog("  No recipe file for %s, treating as base component.", itemNameNorm)
 		rootNode := &CraftingStepNode{
 			ItemName:        itemNameNorm,
@@ -343,12 +307,10 @@ func ExpandItemToTree(
 			rootNode.ErrorMessage = "No recipe file and item acquisition method is N/A via C10M."
 		}
 		return rootNode, nil // No critical error, just no expansion possible
-	} else if statErr != nil { // Other file system error
-		return nil, fmt.Errorf("ExpandItemToTree: error checking recipe file '%s': %w", filePath, statErr)
 	}
 
 	// Recipe file exists, proceed with recursive expansion
-	rootNode, errRec := expandItemRecursiveTree(itemNameNorm, quantity, nil, itemNameNorm, 0, apiResp, metricsMap, itemFilesDir)
+	rootNode, errRec := expandItemRecursiveTree(itemNameNorm, quantity, make(map[string]bool), itemNameNorm, 0, apiResp, metricsMap, itemFilesDir)
 
 	if errRec != nil {
 		// A critical error occurred during recursive expansion (e.g., fs error in sub-call)
@@ -391,18 +353,12 @@ func extractBaseIngredientsFromTree(rootNode *CraftingStepNode) map[string]BaseI
 		return baseMapDetails
 	}
 
-	var queue []*CraftingStepNode
-	queue = append(queue, rootNode)
-	visited := make(map[*CraftingStepNode]bool) // To handle shared sub-nodes if trees were graphs (not strictly needed for pure trees)
-
-	for len(queue) > 0 {
-		curr := queue[0]
-		queue = queue[1:]
-
-		if curr == nil || visited[curr] {
-			continue
-		}
-		visited[curr] = true
+	// Breadth-first, walking the queue by index. Every node is allocated by exactly one expansion call,
+	// so the tree never shares sub-nodes and needs no visited set. BFS order is kept because the first
+	// detail seen for an item is the one retained.
+	queue := []*CraftingStepNode{rootNode}
+	for i := 0; i < len(queue); i++ {
+		curr := queue[i]
 
 		if curr.IsBaseComponent {
 			if curr.Acquisition != nil {
@@ -447,7 +403,7 @@ func extractBaseIngredientsFromTree(rootNode *CraftingStepNode) map[string]BaseI
 }
 
 func analyzeTreeForCostsAndTimes(
-	rootNode *CraftingStepNode, apiResp *HypixelAPIResponse, metricsMap map[string]ProductMetrics,
+	rootNode *CraftingStepNode, baseIngredientsDetailMap map[string]BaseIngredientDetail, apiResp *HypixelAPIResponse, metricsMap map[string]ProductMetrics,
 ) (totalCost float64, slowestFillTimeSecs float64, slowestIngName string, slowestIngQty float64, isPossible bool, errorMsg string) {
 	if rootNode == nil {
 		return math.Inf(1), math.NaN(), "", 0.0, false, "Root node is nil for analysis"
@@ -493,8 +449,7 @@ func analyzeTreeForCostsAndTimes(
 		}
 	}
 
-	// If not a base component, extract all base ingredients from its sub-tree
-	baseIngredientsDetailMap := extractBaseIngredientsFromTree(rootNode)
+	// If not a base component, use the base ingredients the caller extracted from its sub-tree
 	if len(baseIngredientsDetailMap) == 0 {
 		errMsg := rootNode.ErrorMessage
 		if errMsg == "" {
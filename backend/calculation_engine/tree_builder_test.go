@@ -0,0 +1,69 @@
+package main
+
+import (
+	"os"
+	"path/filepath"
+	"strings"
+	"testing"
+)
+
+func TestExpandItemToTree_CycleDetection(t *testing.T) {
+	dir := t.TempDir()
+	recipes := map[string]string{
+		"CYC_A": `{"itemid":"CYC_A","recipe":{"A1":"CYC_B:1","A2":"CYC_D:1","count":1}}`,
+		"CYC_B": `{"itemid":"CYC_B","recipe":{"A1":"DIAMOND:1","A2":"CYC_A:1","count":1}}`, // cycles back to the top-level item
+		"CYC_D": `{"itemid":"CYC_D","recipe":{"A1":"CYC_B:1","A2":"CYC_E:1","count":1}}`,   // CYC_B again, as a sibling path rather than a cycle
+		"CYC_E": `{"itemid":"CYC_E","recipe":{"A1":"CYC_D:1","count":1}}`,                  // cycles back to an intermediate item
+	}
+	for id, body := range recipes {
+		if err := os.WriteFile(filepath.Join(dir, id+".json"), []byte(body), 0o644); err != nil {
+			t.Fatal(err)
+		}
+	}
+
+	// Nothing is on the Bazaar, so every item with a recipe has to be expanded
+	apiResp := &HypixelAPIResponse{Success: true, Products: map[string]HypixelProduct{}}
+	root, err := ExpandItemToTree("CYC_A", 1, apiResp, map[string]ProductMetrics{}, dir)
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+
+	child := func(node *CraftingStepNode, id string) *CraftingStepNode {
+		t.Helper()
+		for _, ing := range node.Ingredients {
+			if ing.ItemName == id {
+				return ing
+			}
+		}
+		t.Fatalf("%s has no ingredient %s", node.ItemName, id)
+		return nil
+	}
+	isCycle := func(node *CraftingStepNode) bool {
+		return node.IsBaseComponent && strings.Contains(node.ErrorMessage, "Cycle detected")
+	}
+
+	cases := []struct {
+		name      string
+		node      *CraftingStepNode
+		wantCycle string // expected message fragment, or "" if the node must not be a cycle
+	}{
+		{"top-level cycle under B", child(child(root, "CYC_B"), "CYC_A"), "to top-level item 'CYC_A'"},
+		{"B reached again via D", child(child(root, "CYC_D"), "CYC_B"), ""},
+		{"top-level cycle under D's B", child(child(child(root, "CYC_D"), "CYC_B"), "CYC_A"), "to top-level item 'CYC_A'"},
+		{"intermediate cycle under E", child(child(child(root, "CYC_D"), "CYC_E"), "CYC_D"), "to intermediate item 'CYC_D'"},
+	}
+	for _, tc := range cases {
+		if tc.wantCycle == "" {
+			if isCycle(tc.node) {
+				t.Errorf("%s: expected no cycle, got %q", tc.name, tc.node.ErrorMessage)
+			}
+			continue
+		}
+		if !isCycle(tc.node) || !strings.Contains(tc.node.ErrorMessage, tc.wantCycle) {
+			t.Errorf("%s: expected cycle message containing %q, got base=%v msg=%q", tc.name, tc.wantCycle, tc.node.IsBaseComponent, tc.node.ErrorMessage)
+		}
+		if wantTopLevel := strings.Contains(tc.wantCycle, "top-level"); tc.node.topLevelCycle != wantTopLevel {
+			t.Errorf("%s: expected topLevelCycle=%v, got %v", tc.name, wantTopLevel, tc.node.topLevelCycle)
+		}
+	}
+}
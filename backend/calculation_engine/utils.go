@@ -16,6 +16,8 @@ import (
 var isDebug = os.Getenv("DEBUG") == "1" || strings.ToLower(os.Getenv("LOG_LEVEL")) == "debug"
 
 // dlog logs debug messages if DEBUG=1 is set or LOG_LEVEL=debug.
+// Its arguments are boxed into interfaces (heap allocations) even when debug logging is off,
+// so calls in per-node hot paths (c10m.go, fill_time.go) are wrapped in `if isDebug`.
 func dlog(format string, args ...interface{}) {
 	if isDebug {
 		// Get caller info for better debug logs
@@ -126,22 +128,23 @@ func BAZAAR_ID(id string) string {
 	return NormalizeItemID(id)
 }
 
+// recipeGridPositions are the standard crafting grid positions, in the order cells are aggregated.
+var recipeGridPositions = [...]string{"A1", "A2", "A3", "B1", "B2", "B3", "C1", "C2", "C3"}
+
 // aggregateCells reads recipe cells ("ITEM_ID:AMOUNT" or "ITEM_ID")
 // and returns a map of NORMALIZED ingredient IDs to their total amounts per single craft.
 func aggregateCells(cells map[string]string) (map[string]float64, error) {
-	// Standard crafting grid positions
-	positions := []string{"A1", "A2", "A3", "B1", "B2", "B3", "C1", "C2", "C3"}
 	ingredients := make(map[string]float64)
 	var firstErrorEncountered error
 
-	for _, pos := range positions {
+	for _, pos := range recipeGridPositions {
 		cellContent := strings.TrimSpace(cells[pos])
 		if cellContent == "" { // Skip empty cells
 			continue
 		}
 
-		parts := strings.SplitN(cellContent, ":", 2)
-		ingIDRaw := strings.TrimSpace(parts[0])
+		idPart, amtPart, hasAmt := strings.Cut(cellContent, ":")
+		ingIDRaw := strings.TrimSpace(idPart)
 		ingIDNormalized := BAZAAR_ID(ingIDRaw) // Normalize the ID
 
 		if ingIDNormalized == "" {
@@ -150,8 +153,8 @@ func aggregateCells(cells map[string]string) (map[string]float64, error) {
 		}
 
 		amt := 1.0 // Default amount if not specified
-		if len(parts) == 2 {
-			amtStr := strings.TrimSpace(parts[1])
+		if hasAmt {
+			amtStr := strings.TrimSpace(amtPart)
 			parsedAmt, err := strconv.ParseFloat(amtStr, 64)
 			if err != nil || parsedAmt <= 0 || math.IsNaN(parsedAmt) || math.IsInf(parsedAmt, 0) {
 				errMsg := fmt.Sprintf("invalid amount '%s' for ingredient '%s' (raw: '%s') in cell '%s'", amtStr, ingIDNormalized, ingIDRaw, pos)
@@ -174,19 +177,6 @@ func aggregateCells(cells map[string]string) (map[string]float64, error) {
 	return ingredients, firstErrorEncountered
 }
 
-// isInPath checks if a NORMALIZED item name is already in the current expansion path.
-// Path stores ItemSteps {name (normalized), quantity}
-func isInPath(itemName string, path []ItemStep) bool {
-	normalizedItemName := BAZAAR_ID(itemName) // Ensure comparison item is also normalized
-	for _, step := range path {
-		// Assuming step.name is already normalized when added to path
-		if step.name == normalizedItemName {
-			return true
-		}
-	}
-	return false
-}
-
 // --- Formatting Helpers ---
 func formatCost(cost float64) string {
 	if math.IsNaN(cost) {
@@ -215,52 +205,59 @@ func sanitizeFloat(f float64) float64 {
 
 // --- Safe Data Access Helpers (from API response and Metrics map) ---
 
-// safeGetProductData retrieves product data from the API response using a normalized ID.
+// safeGetProductData retrieves product data from the API response. productID must already be
+// normalized with BAZAAR_ID; every caller normalizes once up front, so it isn't repeated per lookup.
 func safeGetProductData(apiResp *HypixelAPIResponse, productID string) (HypixelProduct, bool) {
 	if apiResp == nil || apiResp.Products == nil {
 		return HypixelProduct{}, false
 	}
-	lookupID := BAZAAR_ID(productID) // Normalize before lookup
-	productData, ok := apiResp.Products[lookupID]
+	productData, ok := apiResp.Products[productID]
 	return productData, ok
 }
 
-// safeGetMetricsData retrieves metrics data from the map using a normalized ID.
+// safeGetMetricsData retrieves metrics data from the map. productID must already be normalized
+// with BAZAAR_ID (the metrics map is keyed by normalized IDs when it is built).
 func safeGetMetricsData(metricsMap map[string]ProductMetrics, productID string) (ProductMetrics, bool) {
 	if metricsMap == nil {
 		return ProductMetrics{}, false
 	}
-	lookupID := BAZAAR_ID(productID) // Normalize before lookup
-	metricsData, ok := metricsMap[lookupID]
+	metricsData, ok := metricsMap[productID]
 	return metricsData, ok
 }
 
 // getSellPrice safely gets the top sell order price (price to insta-buy).
 // Returns 0.0 if not available or invalid.
 func getSellPrice(apiResp *HypixelAPIResponse, itemID string) float64 {
-	itemIDNorm := BAZAAR_ID(itemID)
-	prod, ok := safeGetProductData(apiResp, itemIDNorm)
-	if !ok || len(prod.SellSummary) == 0 {
-		return 0.0 // No data or no sell orders
-	}
-	price := prod.SellSummary[0].PricePerUnit
-	// Validate price
-	if price <= 0 || math.IsNaN(price) || math.IsInf(price, 0) {
-		return 0.0 // Invalid price
-	}
-	return price
+	prod, _ := safeGetProductData(apiResp, BAZAAR_ID(itemID))
+	return productSellPrice(prod)
 }
 
 // getBuyPrice safely gets the top buy order price (price to insta-sell).
 // Returns 0.0 if not available or invalid.
 func getBuyPrice(apiResp *HypixelAPIResponse, itemID string) float64 {
-	itemIDNorm := BAZAAR_ID(itemID)
-	prod, ok := safeGetProductData(apiResp, itemIDNorm)
-	if !ok || len(prod.BuySummary) == 0 {
+	prod, _ := safeGetProductData(apiResp, BAZAAR_ID(itemID))
+	return productBuyPrice(prod)
+}
+
+// productSellPrice is getSellPrice for product data the caller already looked up
+// (a zero HypixelProduct, as returned for missing items, yields 0.0).
+func productSellPrice(prod HypixelProduct) float64 {
+	if len(prod.SellSummary) == 0 {
+		return 0.0 // No data or no sell orders
+	}
+	return validPriceOrZero(prod.SellSummary[0].PricePerUnit)
+}
+
+// productBuyPrice is getBuyPrice for product data the caller already looked up.
+func productBuyPrice(prod HypixelProduct) float64 {
+	if len(prod.BuySummary) == 0 {
 		return 0.0 // No data or no buy orders
 	}
-	price := prod.BuySummary[0].PricePerUnit
-	// Validate price
+	return validPriceOrZero(prod.BuySummary[0].PricePerUnit)
+}
+
+// validPriceOrZero returns price, or 0.0 if it is not a positive finite number.
+func validPriceOrZero(price float64) float64 {
 	if price <= 0 || math.IsNaN(price) || math.IsInf(price, 0) {
 		return 0.0 // Invalid price
 	}
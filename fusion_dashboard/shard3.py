@@ -4,6 +4,11 @@ import json
 import requests
 from itertools import product
 
+try:
+    import orjson  # Optional: much faster decoding of the bazaar payload
+except ImportError:
+    orjson = None
+
 # IMPORTANT: Using the truncated list of shards as provided.
 shards_data = [
         {'id': 'C1', 'name': 'Grove', 'fusion_quantity': 2, 'max_level': 96, 'ability_name': 'Nature Elemental', 'rarity': 'Common', 'category': 'Forest', 'families': ['Elemental'], 'fusion_results': {'base': 'C4', 'chameleon': ['C2', 'C3', 'C4']}, 'fusion_sources': {'base': None, 'chameleon': []}, 'acquisition': {'type': 'fusion', 'details': [{'recipe_string': 'Common Forest Shard + Uncommon+ Shard', 'components': ['Common', 'Forest', '+', 'Uncommon+']}]}},
@@ -198,7 +203,7 @@ def fetch_raw_bazaar_data():
     try:
         response = requests.get(api_url, timeout=10)
         response.raise_for_status()
-        api_data = response.json()
+        api_data = orjson.loads(response.content) if orjson else response.json()
         if not api_data.get("success"):
             print(f"API Error: {api_data.get('cause', 'Unknown')}")
             return None
@@ -255,6 +260,14 @@ def generate_fully_expanded_recipes(shards_data, shard_prices):
     shards_map = {shard['id']: shard for shard in shards_data}
     all_recipes, total_recipe_count = {}, 0
     rarity_order = ['Common', 'Uncommon', 'Rare', 'Epic', 'Legendary']
+    special_families = {'Elemental', 'Amphibian', 'Reptile'}
+    # A shard's component entry (quantity, prices) and reptile flag are the same in every recipe, so build them once
+    shard_components = {}
+    for shard_id, shard in shards_map.items():
+        families = shard.get('families', [])
+        component = {"quantity": 2 if any(fam in special_families for fam in families) else 5, "name": shard['name'], "id": shard_id}
+        add_prices_to_component(component, shard_prices)
+        shard_components[shard_id] = (component, 'Reptile' in families)
     print("\nStarting recipe generation...")
     for target_shard in shards_data:
         target_id, target_name = target_shard['id'], target_shard['name']
@@ -264,23 +277,12 @@ def generate_fully_expanded_recipes(shards_data, shard_prices):
             if isinstance(base_sources, str): base_sources = [base_sources]
             for source_id in base_sources:
                 if source_id not in shards_map: continue
-                source_shard = shards_map[source_id]
-                for filler_id in list(shards_map.keys()):
-                    filler_shard = shards_map[filler_id]
-                    is_source_special = any(fam in {'Elemental', 'Amphibian', 'Reptile'} for fam in source_shard.get('families', []))
-                    is_filler_special = any(fam in {'Elemental', 'Amphibian', 'Reptile'} for fam in filler_shard.get('families', []))
-                    
+                source_component, is_source_reptile = shard_components[source_id]
+                for filler_component, is_filler_reptile in shard_components.values():
                     # A Reptile component in either slot bumps the output quantity
-                    is_source_reptile = 'Reptile' in source_shard.get('families', [])
-                    is_filler_reptile = 'Reptile' in filler_shard.get('families', [])
                     output_quantity = 1.2 if is_source_reptile or is_filler_reptile else 1.0
                     
-                    recipe_components = [
-                        {"quantity": 2 if is_source_special else 5, "name": source_shard['name'], "id": source_id},
-                        {"quantity": 2 if is_filler_special else 5, "name": filler_shard['name'], "id": filler_id}
-                    ]
-                    for comp in recipe_components:
-                        add_prices_to_component(comp, shard_prices)
+                    recipe_components = [dict(source_component), dict(filler_component)]
                     
                     recipes_for_current_shard.append({
                         "type": "Base Fusion (Expanded)",
@@ -312,6 +314,7 @@ def run_data_generation():
         output_filename = 'fusion_recipes_temp.json'
         print(f"--- SAVING DATA to temporary file '{output_filename}' ---")
         try:
+            # Always written with the stdlib so the file format doesn't depend on orjson being installed
             with open(output_filename, 'w') as f:
                 json.dump(fusion_recipes, f, indent=4)
             print(f"--- SUCCESSFULLY WROTE TEMP FILE ---")
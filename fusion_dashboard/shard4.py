@@ -1,91 +1,135 @@
 # shard4.py
 
+import heapq
 import json
+import os
 from flask import Flask, render_template
 
+try:
+    import orjson  # Optional: parses the multi-MB recipe file several times faster than json
+except ImportError:
+    orjson = None
+
 app = Flask(__name__)
 
 FINAL_DATA_FILE = "fusion_recipes_with_prices.json"
+NUM_ITEMS_TO_SHOW = 10 # Rows rendered per strategy table
+
+# (strategy key, revenue column, cost_summary key); revenue column 0 = insta-sell revenue, 1 = sell-order revenue
+STRATEGIES = (
+    ("ib_both_is_prod", 0, "cost_instabuy_both"),
+    ("ib_c1_bo_c2_is_prod", 0, "cost_buy_order_c1_instabuy_c2"),
+    ("bo_c1_ib_c2_is_prod", 0, "cost_instabuy_c1_buy_order_c2"),
+    ("bo_both_is_prod", 0, "cost_buy_order_both"),
+    ("ib_both_so_prod", 1, "cost_instabuy_both"),
+    ("ib_c1_bo_c2_so_prod", 1, "cost_buy_order_c1_instabuy_c2"),
+    ("bo_c1_ib_c2_so_prod", 1, "cost_instabuy_c1_buy_order_c2"),
+    ("bo_both_so_prod", 1, "cost_buy_order_both"),
+)
+
+# (data file mtime, report) for the last analyzed data file; the generator replaces the file atomically
+_report_cache = (None, None)
+_page_cache = (None, None)
 
 def load_recipe_data():
     """Loads the final, validated recipe data file."""
     try:
+        if orjson:
+            with open(FINAL_DATA_FILE, 'rb') as f:
+                return orjson.loads(f.read())
         with open(FINAL_DATA_FILE, 'r') as f:
             return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+    except (FileNotFoundError, json.JSONDecodeError): # orjson.JSONDecodeError subclasses json.JSONDecodeError
         return None
 
-def analyze_and_categorize_strategies(all_recipe_data):
-    """Analyzes the data, now accounting for variable output quantities."""
+def analyze_and_categorize_strategies(all_recipe_data, top_n=NUM_ITEMS_TO_SHOW):
+    """Analyzes the data, now accounting for variable output quantities.
+
+    For each strategy, keeps the most profitable recipe per craft target and returns the top_n targets.
+    """
     if not all_recipe_data: return {}
     
-    strategy_keys = [
-        "ib_both_is_prod", "ib_c1_bo_c2_is_prod", "bo_c1_ib_c2_is_prod", "bo_both_is_prod",
-        "ib_both_so_prod", "ib_c1_bo_c2_so_prod", "bo_c1_ib_c2_so_prod", "bo_both_so_prod"
-    ]
-    categorized_profits = {key: [] for key in strategy_keys}
-    def safe_subtract(a, b): return a - b if a is not None and b is not None else None
+    # strategy -> one {"target", "recipe", "profit"} per craft target: its most profitable recipe
+    best_per_target = {key: [] for key, _, _ in STRATEGIES}
     
     for target_key, item_data in all_recipe_data.items():
         market_price = item_data.get("market_price", {})
         # These are the base prices for ONE shard
         insta_sell_price = market_price.get("insta_sell_revenue")
         sell_order_price = market_price.get("insta_buy_cost")
+        if insta_sell_price is None and sell_order_price is None: continue # No strategy can be priced
 
+        # Best (profit, recipe) so far for each strategy; a target's recipes are all in this one entry
+        target_best = [None] * len(STRATEGIES)
         for recipe in item_data.get("recipes", []):
             # Output quantity for this specific recipe (defaults to 1.0 if not present)
             output_quantity = recipe.get("produces", {}).get("quantity", 1.0)
 
             # Total revenue for this fusion, scaled by output quantity
-            total_insta_sell_revenue = insta_sell_price * output_quantity if insta_sell_price is not None else None
-            total_sell_order_revenue = sell_order_price * output_quantity if sell_order_price is not None else None
-
+            revenues = (
+                insta_sell_price * output_quantity if insta_sell_price is not None else None,
+                sell_order_price * output_quantity if sell_order_price is not None else None,
+            )
             craft_costs = recipe.get("cost_summary", {})
 
-            profits = {
-                "ib_both_is_prod": safe_subtract(total_insta_sell_revenue, craft_costs.get("cost_instabuy_both")),
-                "bo_c1_ib_c2_is_prod": safe_subtract(total_insta_sell_revenue, craft_costs.get("cost_instabuy_c1_buy_order_c2")),
-                "ib_c1_bo_c2_is_prod": safe_subtract(total_insta_sell_revenue, craft_costs.get("cost_buy_order_c1_instabuy_c2")),
-                "bo_both_is_prod": safe_subtract(total_insta_sell_revenue, craft_costs.get("cost_buy_order_both")),
-                "ib_both_so_prod": safe_subtract(total_sell_order_revenue, craft_costs.get("cost_instabuy_both")),
-                "bo_c1_ib_c2_so_prod": safe_subtract(total_sell_order_revenue, craft_costs.get("cost_instabuy_c1_buy_order_c2")),
-                "ib_c1_bo_c2_so_prod": safe_subtract(total_sell_order_revenue, craft_costs.get("cost_buy_order_c1_instabuy_c2")),
-                "bo_both_so_prod": safe_subtract(total_sell_order_revenue, craft_costs.get("cost_buy_order_both")),
-            }
-
-            for key, profit in profits.items():
-                if profit is not None and profit > 0:
-                    c1, c2 = recipe["recipe_components"]
-                    recipe_str = f"{c1['quantity']}x {c1['name']} + {c2['quantity']}x {c2['name']}"
-                    categorized_profits[key].append({"target": target_key, "recipe_str": recipe_str, "profit": profit})
+            for i, (_, revenue_index, cost_key) in enumerate(STRATEGIES):
+                revenue = revenues[revenue_index]
+                cost = craft_costs.get(cost_key)
+                if revenue is None or cost is None: continue
+                profit = revenue - cost
+                # Strictly greater keeps the first recipe on ties, as the old stable sort + first-seen dedup did
+                if profit > 0 and (target_best[i] is None or profit > target_best[i][0]):
+                    target_best[i] = (profit, recipe)
+
+        for (key, _, _), best in zip(STRATEGIES, target_best):
+            if best is not None:
+                best_per_target[key].append({"target": target_key, "recipe": best[1], "profit": best[0]})
 
     final_report = {}
-    for key, profit_list in categorized_profits.items():
-        profit_list.sort(key=lambda x: x['profit'], reverse=True)
+    for key, bests in best_per_target.items():
         unique_top_items = []
-        seen_targets = set()
-        for item in profit_list:
-            if item['target'] not in seen_targets:
-                item['profit_str'] = f"{item['profit']:,.0f}"
-                unique_top_items.append(item)
-                seen_targets.add(item['target'])
+        for item in heapq.nlargest(top_n, bests, key=lambda x: x['profit']):
+            c1, c2 = item.pop("recipe")["recipe_components"]
+            item['recipe_str'] = f"{c1['quantity']}x {c1['name']} + {c2['quantity']}x {c2['name']}"
+            item['profit_str'] = f"{item['profit']:,.0f}"
+            unique_top_items.append(item)
         final_report[key] = unique_top_items
     return final_report
 
+def get_strategy_report():
+    """Returns the categorized report for the current data file, re-reading and re-analyzing it only when it changes."""
+    global _report_cache
+    try:
+        mtime = os.stat(FINAL_DATA_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached_mtime, report = _report_cache
+    if cached_mtime != mtime:
+        full_data = load_recipe_data()
+        report = analyze_and_categorize_strategies(full_data) if full_data else None
+        _report_cache = (mtime, report)
+    return report
+
+HEADERS = {
+    "ib_both_is_prod": "1. Insta-Buy Comps -> Insta-Sell Product", "bo_c1_ib_c2_is_prod": "2. Mixed (BO/IB) -> IS", "ib_c1_bo_c2_is_prod": "3. Mixed (IB/BO) -> IS",
+    "bo_both_is_prod": "4. Buy-Order Comps -> Insta-Sell Product", "ib_both_so_prod": "5. Insta-Buy Comps -> Sell-Order Product", "bo_c1_ib_c2_so_prod": "6. Mixed (BO/IB) -> SO",
+    "ib_c1_bo_c2_so_prod": "7. Mixed (IB/BO) -> SO", "bo_both_so_prod": "8. Buy-Order Comps -> Sell-Order Product",
+}
+
 @app.route('/')
 def index():
     """The main page of the web app."""
-    HEADERS = {
-        "ib_both_is_prod": "1. Insta-Buy Comps -> Insta-Sell Product", "bo_c1_ib_c2_is_prod": "2. Mixed (BO/IB) -> IS", "ib_c1_bo_c2_is_prod": "3. Mixed (IB/BO) -> IS",
-        "bo_both_is_prod": "4. Buy-Order Comps -> Insta-Sell Product", "ib_both_so_prod": "5. Insta-Buy Comps -> Sell-Order Product", "bo_c1_ib_c2_so_prod": "6. Mixed (BO/IB) -> SO",
-        "ib_c1_bo_c2_so_prod": "7. Mixed (IB/BO) -> SO", "bo_both_so_prod": "8. Buy-Order Comps -> Sell-Order Product",
-    }
-    full_data = load_recipe_data()
-    if not full_data:
+    global _page_cache
+    categorized_data = get_strategy_report()
+    if categorized_data is None:
         return "<h1>Waiting for initial data... The page will refresh automatically.</h1>", 202
-    
-    categorized_data = analyze_and_categorize_strategies(full_data)
-    return render_template('index.html', report_data=categorized_data, headers=HEADERS, num_items_to_show=10)
+
+    # The page only depends on the report, so render it once per data file instead of on every 20s refresh
+    cached_report, page = _page_cache
+    if cached_report is not categorized_data:
+        page = render_template('index.html', report_data=categorized_data, headers=HEADERS, num_items_to_show=NUM_ITEMS_TO_SHOW)
+        _page_cache = (categorized_data, page)
+    return page
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5001, debug=False) # Changed port to 5000 for consistency
\ No newline at end of file
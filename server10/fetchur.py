@@ -1,6 +1,10 @@
 # all_in_one_flipper.py - Deploy this single file to Koyeb
 
+import heapq
+from collections import namedtuple
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import os
 import threading
@@ -20,116 +24,151 @@ REPORT_INTERVAL_CYCLES = 4 # Update stable list every 2 minutes
 shared_data = {
     "last_updated_utc": None,
     "stable_items": [],
+    "profit_report": None, # Latest /flipper text, rebuilt by the background thread after every fetch
     "is_analyzing": True
 }
 data_lock = threading.Lock()
 
+# --- HTTP Session (keep-alive + connection pool, reused by every fetch) ---
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=2))
+
+# --- Compact per-product record: the only fields the analysis reads ---
+# top_buy/bot_sell are None when the product can't be priced (missing summaries or quick_status)
+ProductSnapshot = namedtuple("ProductSnapshot", ["top_buy", "bot_sell", "buy_orders", "sell_orders", "buy_moving_week", "sell_moving_week"])
+
+def compact_products(products):
+    """Reduces the raw bazaar payload to one ProductSnapshot per product id."""
+    snapshot = {}
+    for pid, data in products.items():
+        buy_summary = data.get("buy_summary", [])
+        sell_summary = data.get("sell_summary", [])
+        status = data.get("quick_status", {})
+        priced = bool(buy_summary and sell_summary and status)
+        snapshot[pid] = ProductSnapshot(
+            buy_summary[0]['pricePerUnit'] if priced else None,
+            sell_summary[0]['pricePerUnit'] if priced else None,
+            status.get('buyOrders', 0), status.get('sellOrders', 0),
+            status.get('buyMovingWeek', 0), status.get('sellMovingWeek', 0),
+        )
+    return snapshot
+
 # 1. BACKGROUND THREAD: Continuously finds stable items
 def run_volatility_analysis():
     """This function runs in the background 24/7 to find stable items."""
     global shared_data
     item_states, item_analytics, cycle_count = {}, {}, 0
+    stable_items = [] # Only this thread writes the stable list, so keep a local copy for the profit report
+    samples_per_minute = 60 / TRACKING_INTERVAL_SECONDS
     print("🚀 Background volatility analysis thread started.")
 
     while True:
         cycle_count += 1
         try:
-            response = requests.get(HYPIXEL_API_URL, timeout=10)
-            current_products = response.json().get("products", {})
+            response = http_session.get(HYPIXEL_API_URL, timeout=10)
+            current_products = compact_products(orjson.loads(response.content).get("products", {}))
         except Exception as e:
             print(f"BACKGROUND ERROR: Could not fetch data: {e}")
             time.sleep(TRACKING_INTERVAL_SECONDS)
             continue
-
-        for pid, data in current_products.items():
-            status = data.get("quick_status", {})
-            orders = (status.get('buyOrders', 0), status.get('sellOrders', 0))
-            if pid in item_states:
-                change = abs(orders[0] - item_states[pid][0]) + abs(orders[1] - item_states[pid][1])
-                if pid not in item_analytics: item_analytics[pid] = {"total_change": 0, "samples": 0}
-                analytics = item_analytics[pid]
+        for pid, product in current_products.items():
+            orders = (product.buy_orders, product.sell_orders)
+            previous = item_states.get(pid)
+            if previous is not None:
+                change = abs(orders[0] - previous[0]) + abs(orders[1] - previous[1])
+                analytics = item_analytics.get(pid)
+                if analytics is None: analytics = item_analytics[pid] = {"total_change": 0, "samples": 0}
                 analytics["total_change"] += change
                 analytics["samples"] += 1
-                analytics["avg_per_min"] = (analytics["total_change"] / analytics["samples"]) * (60 / TRACKING_INTERVAL_SECONDS)
+                analytics["avg_per_min"] = (analytics["total_change"] / analytics["samples"]) * samples_per_minute
             item_states[pid] = orders
             
-        if cycle_count % REPORT_INTERVAL_CYCLES == 0:
-            latest_stable = [pid for pid, a in item_analytics.items() if a.get("avg_per_min", 999) < STABILITY_THRESHOLD]
-            with data_lock:
-                shared_data["stable_items"] = latest_stable
+        new_stable_list = cycle_count % REPORT_INTERVAL_CYCLES == 0
+        if new_stable_list:
+            stable_items = [pid for pid, a in item_analytics.items() if a.get("avg_per_min", 999) < STABILITY_THRESHOLD]
+
+        # Build the profit report here, off the request path, so /flipper only serves the finished text
+        try:
+            profit_report = analyze_for_profit(stable_items, current_products)
+        except Exception as e:
+            print(f"BACKGROUND ERROR: Could not build profit report: {e}")
+            profit_report = None # Keep serving the previous report
+        with data_lock:
+            if profit_report is not None:
+                shared_data["profit_report"] = profit_report
+            if new_stable_list:
+                shared_data["stable_items"] = stable_items
                 shared_data["last_updated_utc"] = time.strftime('%Y-%m-%d %H:%M:%S')
                 shared_data["is_analyzing"] = False # Mark initial analysis as complete
-            print(f"BACKGROUND: Stability report generated. Found {len(latest_stable)} stable items.")
+        if new_stable_list:
+            print(f"BACKGROUND: Stability report generated. Found {len(stable_items)} stable items.")
         time.sleep(TRACKING_INTERVAL_SECONDS)
 
-# 2. ON-DEMAND ANALYSIS: Runs only when the /flipper URL is visited
-def analyze_for_profit(stable_item_ids):
-    """Fetches Hypixel data and analyzes the provided stable items for profit."""
+# 2. PROFIT ANALYSIS: Run by the background thread after every fetch; /flipper serves the latest result
+def analyze_for_profit(stable_item_ids, all_products):
+    """Analyzes the provided stable items for profit using the latest bazaar snapshot."""
     if not stable_item_ids:
         return "No stable items available to analyze yet."
-
-    try:
-        print("FLIPPER: Fetching Hypixel data for profit analysis...")
-        response = requests.get(HYPIXEL_API_URL, timeout=10)
-        all_products = response.json().get("products", {})
-        print("FLIPPER: Data received. Analyzing for profit...")
-    except Exception as e:
-        return f"Error fetching data from Hypixel API: {e}"
+    if not all_products:
+        return "No bazaar data available yet. Please refresh in a moment."
 
     results = []
     for pid in stable_item_ids:
-        data = all_products.get(pid)
-        if not data: continue
-        
-        buy_summary = data.get("buy_summary", [])
-        sell_summary = data.get("sell_summary", [])
-        status = data.get("quick_status", {})
-        if not buy_summary or not sell_summary or not status: continue
+        product = all_products.get(pid)
+        if product is None or product.top_buy is None: continue
 
-        total_orders = status.get('buyOrders', 0) + status.get('sellOrders', 0)
+        total_orders = product.buy_orders + product.sell_orders
         if total_orders > MAX_ACTIVE_ORDERS: continue
 
-        top_buy = buy_summary[0]['pricePerUnit']
-        bot_sell = sell_summary[0]['pricePerUnit']
+        top_buy = product.top_buy
+        bot_sell = product.bot_sell
         if bot_sell <= 0: continue
         
         margin = (top_buy - bot_sell) / bot_sell
         if margin < PROFIT_MARGIN_THRESHOLD: continue
 
         profit_per_item = top_buy - bot_sell
-        volume = min(status.get('buyMovingWeek', 0), status.get('sellMovingWeek', 0))
+        volume = min(product.buy_moving_week, product.sell_moving_week)
         profit_per_hour = (profit_per_item * volume) / 168 # 168 hours in a week
         results.append({
             'name': pid.replace("_", " ").title(),
-            'profit_hr': f"{profit_per_hour:,.0f}",
-            'margin': f"{margin:.1%}",
-            'orders': f"{total_orders:,}",
-            'spread': f"{profit_per_item:,.2f}"
+            'profit_hr': profit_per_hour,
+            'margin': margin,
+            'orders': total_orders,
+            'spread': profit_per_item
         })
 
     if not results:
         return "Analysis complete. No stable items were found that also met your profit criteria."
 
-    results.sort(key=lambda x: float(x['profit_hr'].replace(",", "")), reverse=True)
-    
+    top_results = heapq.nlargest(50, results, key=lambda x: x['profit_hr']) # Show top 50
+
+    # Format only the rows that are displayed; ranking above uses the raw numbers
+    shown = [{
+        'name': row['name'],
+        'profit_hr': f"{row['profit_hr']:,.0f}",
+        'margin': f"{row['margin']:.1%}",
+        'orders': f"{row['orders']:,}",
+        'spread': f"{row['spread']:,.2f}"
+    } for row in top_results]
+
     # Format results into a clean text table
     headers = ["Item Name", "Profit/Hour", "Margin %", "Active Orders", "Profit Spread"]
-    col_widths = [len(h) for h in headers]
-    for row in results:
-        col_widths = [max(col_widths[i], len(row[k])) for i, k in enumerate(['name', 'profit_hr', 'margin', 'orders', 'spread'])]
+    columns = ('name', 'profit_hr', 'margin', 'orders', 'spread')
+    col_widths = [max(len(h), max((len(row[k]) for row in shown), default=0)) for h, k in zip(headers, columns)]
 
     header_line = " | ".join(h.ljust(w) for h, w in zip(headers, col_widths))
     divider = "-+-".join("-" * w for w in col_widths)
     
-    data_lines = []
-    for row in results[:50]: # Show top 50
-        line = row['name'].ljust(col_widths[0])
-        line += " | " + row['profit_hr'].rjust(col_widths[1])
-        line += " | " + row['margin'].rjust(col_widths[2])
-        line += " | " + row['orders'].rjust(col_widths[3])
-        line += " | " + row['spread'].rjust(col_widths[4])
-        data_lines.append(line)
-        
+    # Build each row in one join instead of growing it with repeated += concatenation
+    data_lines = [" | ".join((
+        row['name'].ljust(col_widths[0]),
+        row['profit_hr'].rjust(col_widths[1]),
+        row['margin'].rjust(col_widths[2]),
+        row['orders'].rjust(col_widths[3]),
+        row['spread'].rjust(col_widths[4])
+    )) for row in shown]
+
     return f"--- Top Profitable & Stable Bazaar Flips ---\n\n{header_line}\n{divider}\n" + "\n".join(data_lines)
 
 # 3. FLASK WEB SERVER: Serves the results to your browser
@@ -142,17 +181,14 @@ def home():
 
 @app.route('/flipper')
 def get_flipper_results():
-    """The main endpoint to trigger the analysis and show results."""
+    """The main endpoint to show the latest analysis results."""
     with data_lock:
         is_analyzing = shared_data["is_analyzing"]
-        stable_items = shared_data["stable_items"]
+        result_string = shared_data["profit_report"]
 
     if is_analyzing:
         return Response("The server has just started. Please wait 2-3 minutes for the first stability analysis to complete, then refresh this page.", mimetype='text/plain')
 
-    # Run the analysis and get the formatted string
-    result_string = analyze_for_profit(stable_items)
-    
     # Return the string as pre-formatted text, which looks great in a browser
     return Response(f"<pre>{result_string}</pre>")
 